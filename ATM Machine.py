@@ -1,13 +1,13 @@
 import tkinter as tk
 from tkinter import messagebox, simpledialog, scrolledtext
-import sqlite3
-from datetime import datetime
 import os
+from atm_service import ATMService, ATMError, now
 
 class ATMApp:
     DB_FILE = "atm.db"
+    PAGE_SIZE = 100
 
-    def __init__(self, root):
+    def __init__(self, root, group_commit=False):
         self.root = root
         self.root.title("Premium Python ATM")
         self.root.geometry("820x620")
@@ -22,71 +22,18 @@ class ATMApp:
         self.font_title = ("Segoe UI", 20, "bold")
         self.font_base = ("Segoe UI", 12)
         self.current_account = None
+        self.session = None
         db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), self.DB_FILE)
-        self.conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
-        self.create_tables()
-        self.seed_accounts_if_empty()
+        self.service = ATMService(db_path, group_commit=group_commit)
         self.create_login_screen()
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
-    def create_tables(self):
-        cur = self.conn.cursor()
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS accounts (
-                card TEXT PRIMARY KEY,
-                pin TEXT NOT NULL,
-                name TEXT NOT NULL,
-                balance REAL NOT NULL,
-                created_at TEXT NOT NULL
-            )
-        """)
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS transactions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                card TEXT NOT NULL,
-                type TEXT NOT NULL,
-                amount REAL NOT NULL,
-                balance_after REAL NOT NULL,
-                timestamp TEXT NOT NULL,
-                FOREIGN KEY(card) REFERENCES accounts(card)
-            )
-        """)
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS login_logout (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                card TEXT,
-                name TEXT,
-                action TEXT NOT NULL,
-                timestamp TEXT NOT NULL
-            )
-        """)
-        self.conn.commit()
-
-    def seed_accounts_if_empty(self):
-        cur = self.conn.cursor()
-        cur.execute("SELECT COUNT(*) FROM accounts")
-        (count,) = cur.fetchone()
-        if count == 0:
-            now = self.now()
-            demo = [
-                ("123456", "7890", "Anamul Haque", 5000.00, now),
-            ]
-            cur.executemany(
-                "INSERT OR IGNORE INTO accounts(card,pin,name,balance,created_at) VALUES(?,?,?,?,?)",
-                demo
-            )
-            self.conn.commit()
-
     def on_close(self):
         try:
-            self.conn.commit()
-            self.conn.close()
+            self.service.close()
         finally:
             self.root.destroy()
 
-    def now(self):
-        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
     def clear_screen(self):
         for w in self.root.winfo_children():
             w.destroy()
@@ -126,8 +73,8 @@ class ATMApp:
         self.clear_screen()
         frame = tk.Frame(self.root, bg=self.bg)
         frame.pack(fill=tk.BOTH, expand=True)
-        self.create_header(frame, f"Welcome — {self.account_get_name(self.current_account)}")
-        bal = self.account_get_balance(self.current_account)
+        self.create_header(frame, f"Welcome — {self.session['name']}")
+        bal = self.session["balance"]
         bal_panel = tk.Frame(frame, bg=self.panel, padx=16, pady=12)
         bal_panel.pack(fill=tk.X, padx=12)
         tk.Label(bal_panel, text=f"Current Balance", bg=self.panel, fg="#a8bedb", font=("Segoe UI", 12)).pack(anchor="w")
@@ -137,55 +84,12 @@ class ATMApp:
         def make_btn(text, cmd, bg=None):
             b = tk.Button(grid, text=text, font=self.font_base, bg=bg or self.btn, fg="white", width=26, height=2, command=cmd)
             return b
-        make_btn("Check Balance", lambda: messagebox.showinfo("Balance", f"Balance: ${self.account_get_balance(self.current_account):,.2f}")).grid(row=0, column=0, padx=12, pady=8)
+        make_btn("Check Balance", lambda: messagebox.showinfo("Balance", f"Balance: ${self.session['balance']:,.2f}")).grid(row=0, column=0, padx=12, pady=8)
         make_btn("Withdraw Cash", self.withdraw).grid(row=0, column=1, padx=12, pady=8)
         make_btn("Deposit Cash", self.deposit).grid(row=1, column=0, padx=12, pady=8)
         make_btn("My Transaction History", self.show_transaction_history, bg="#10b981").grid(row=1, column=1, padx=12, pady=8)
-        make_btn("Logout", self.logout, bg=self.warn).grid(row=2, column=0, columnspan=2, pady=18)
-
-    def account_exists(self, card):
-        cur = self.conn.cursor()
-        cur.execute("SELECT 1 FROM accounts WHERE card=?", (card,))
-        return cur.fetchone() is not None
-
-    def account_check_pin(self, card, pin):
-        cur = self.conn.cursor()
-        cur.execute("SELECT pin FROM accounts WHERE card=?", (card,))
-        row = cur.fetchone()
-        return (row and row[0] == pin)
-
-    def account_get_balance(self, card):
-        cur = self.conn.cursor()
-        cur.execute("SELECT balance FROM accounts WHERE card=?", (card,))
-        r = cur.fetchone()
-        return float(r[0]) if r else 0.0
-
-    def account_get_name(self, card):
-        cur = self.conn.cursor()
-        cur.execute("SELECT name FROM accounts WHERE card=?", (card,))
-        r = cur.fetchone()
-        return r[0] if r else "Unknown"
-
-    def account_update_balance(self, card, new_balance):
-        cur = self.conn.cursor()
-        cur.execute("UPDATE accounts SET balance=? WHERE card=?", (new_balance, card))
-        self.conn.commit()
-
-    def insert_transaction(self, card, ttype, amount, balance_after):
-        cur = self.conn.cursor()
-        cur.execute(
-            "INSERT INTO transactions(card,type,amount,balance_after,timestamp) VALUES(?,?,?,?,?)",
-            (card, ttype, amount, balance_after, self.now())
-        )
-        self.conn.commit()
-
-    def insert_login_logout(self, card, name, action):
-        cur = self.conn.cursor()
-        cur.execute(
-            "INSERT INTO login_logout(card,name,action,timestamp) VALUES(?,?,?,?)",
-            (card, name, action, self.now())
-        )
-        self.conn.commit()
+        make_btn("Monthly Statement", self.show_monthly_statement, bg="#10b981").grid(row=2, column=0, padx=12, pady=8)
+        make_btn("Logout", self.logout, bg=self.warn).grid(row=2, column=1, padx=12, pady=8)
 
     def login(self):
         card = self.card_entry.get().strip()
@@ -193,22 +97,22 @@ class ATMApp:
         if not card or not pin:
             messagebox.showwarning("Input", "Please enter card and PIN")
             return
-        if not self.account_exists(card):
-            messagebox.showerror("Error", "Card number not found")
-            return
-        if not self.account_check_pin(card, pin):
-            messagebox.showerror("Error", "Incorrect PIN")
+        try:
+            acct = self.service.login(card, pin)
+        except ATMError as e:
+            messagebox.showerror("Error", str(e))
             self.pin_entry.delete(0, tk.END)
             return
         self.current_account = card
-        self.insert_login_logout(card, self.account_get_name(card), "Login")
-        messagebox.showinfo("Welcome", f"Login successful. Welcome {self.account_get_name(card)}")
+        self.session = acct
+        messagebox.showinfo("Welcome", f"Login successful. Welcome {acct['name']}")
         self.create_main_menu()
 
     def logout(self):
         if self.current_account:
-            self.insert_login_logout(self.current_account, self.account_get_name(self.current_account), "Logout")
+            self.service.logout(self.session)
         self.current_account = None
+        self.session = None
         messagebox.showinfo("Logged out", "You have been logged out.")
         self.create_login_screen()
 
@@ -225,13 +129,12 @@ class ATMApp:
         except:
             messagebox.showerror("Error", "Invalid amount")
             return
-        bal = self.account_get_balance(self.current_account)
-        if amt > bal:
-            messagebox.showerror("Error", "Insufficient balance")
+        try:
+            new_bal = self.service.withdraw(self.current_account, amt)
+        except ATMError as e:
+            messagebox.showerror("Error", str(e))
             return
-        new_bal = bal - amt
-        self.account_update_balance(self.current_account, new_bal)
-        self.insert_transaction(self.current_account, "Withdrawal", amt, new_bal)
+        self.session["balance"] = new_bal
         messagebox.showinfo("Done", f"Withdrew ${amt:,.2f}\nNew balance: ${new_bal:,.2f}")
         self.create_main_menu()
 
@@ -248,52 +151,117 @@ class ATMApp:
         except:
             messagebox.showerror("Error", "Invalid amount")
             return
-        bal = self.account_get_balance(self.current_account)
-        new_bal = bal + amt
-        self.account_update_balance(self.current_account, new_bal)
-        self.insert_transaction(self.current_account, "Deposit", amt, new_bal)
+        try:
+            new_bal = self.service.deposit(self.current_account, amt)
+        except ATMError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.session["balance"] = new_bal
         messagebox.showinfo("Done", f"Deposited ${amt:,.2f}\nNew balance: ${new_bal:,.2f}")
         self.create_main_menu()
 
+    def create_paged_text(self, win, fetch, fmt, empty):
+        st = scrolledtext.ScrolledText(win, font=("Consolas", 11), bg="#071126", fg=self.text, padx=8, pady=8)
+        st.pack(fill=tk.BOTH, expand=True, padx=12, pady=8)
+        state = {"last": None, "done": False}
+
+        def load_more():
+            if state["done"]:
+                return
+            rows = fetch(state["last"])
+            state["done"] = len(rows) < self.PAGE_SIZE
+            st.configure(state=tk.NORMAL)
+            if rows:
+                state["last"] = rows[-1]
+                st.insert(tk.END, "".join(fmt(r) for r in rows))
+            elif state["last"] is None:
+                st.insert(tk.END, empty)
+            st.configure(state=tk.DISABLED)
+
+        def on_scroll(first, last):
+            st.vbar.set(first, last)
+            if float(last) > 0.9:
+                st.after_idle(load_more)
+
+        st.configure(yscrollcommand=on_scroll)
+        load_more()
+        return st
+
     def show_transaction_history(self):
         if not self.current_account:
             return
-        cur = self.conn.cursor()
-        cur.execute("SELECT type,amount,balance_after,timestamp FROM transactions WHERE card=? ORDER BY id DESC", (self.current_account,))
-        rows = cur.fetchall()
+        card = self.current_account
         win = tk.Toplevel(self.root)
         win.title("Transaction History")
         win.geometry("760x520")
         win.configure(bg=self.bg)
-        self.create_header(win, f"Transactions — {self.account_get_name(self.current_account)}")
+        self.create_header(win, f"Transactions — {self.session['name']}")
+        self.create_paged_text(
+            win, lambda last: self.service.transactions(card, last and last[0], self.PAGE_SIZE),
+            lambda r: f"{r[4]}  |  {r[1]:<10}  |  ${r[2]:>10,.2f}  |  Balance: ${r[3]:>10,.2f}\n",
+            "No transactions found.\n"
+        )
+        tk.Button(win, text="Close", bg=self.btn, fg="white", command=win.destroy).pack(pady=8)
+
+    def show_monthly_statement(self):
+        if not self.current_account:
+            return
+        month = simpledialog.askstring("Monthly Statement", "Month (YYYY-MM):", initialvalue=now()[:7], parent=self.root)
+        if not month:
+            return
+        month = month.strip()
+        if len(month) != 7 or month[4] != "-" or not (month[:4] + month[5:]).isdigit():
+            messagebox.showerror("Error", "Invalid month")
+            return
+        stmt = self.service.monthly_statement(self.current_account, month)
+        win = tk.Toplevel(self.root)
+        win.title("Monthly Statement")
+        win.geometry("760x520")
+        win.configure(bg=self.bg)
+        self.create_header(win, f"Statement {month} — {self.session['name']}")
         st = scrolledtext.ScrolledText(win, font=("Consolas", 11), bg="#071126", fg=self.text, padx=8, pady=8)
         st.pack(fill=tk.BOTH, expand=True, padx=12, pady=8)
-        if not rows:
-            st.insert(tk.END, "No transactions found.\n")
-        else:
-            for r in rows:
-                st.insert(tk.END, f"{r[3]}  |  {r[0]:<10}  |  ${r[1]:>10,.2f}  |  Balance: ${r[2]:>10,.2f}\n")
+        lines = [f"Opening balance: ${stmt['opening']:,.2f}\n\n",
+                 f"{'Day':<12}{'Deposits':>14}{'Withdrawals':>14}{'Count':>7}{'Closing':>16}\n"]
+        lines += [f"{d[0]:<12}{d[1]:>14,.2f}{d[2]:>14,.2f}{d[3]:>7}{d[4]:>16,.2f}\n" for d in stmt["days"]]
+        lines.append(f"\n{'Total':<12}{stmt['deposits']:>14,.2f}{stmt['withdrawals']:>14,.2f}{stmt['count']:>7}\n")
+        lines.append(f"Closing balance: ${stmt['closing']:,.2f}\n")
+        st.insert(tk.END, "".join(lines))
         st.configure(state=tk.DISABLED)
         tk.Button(win, text="Close", bg=self.btn, fg="white", command=win.destroy).pack(pady=8)
 
     def show_login_logout_history(self):
-        cur = self.conn.cursor()
-        cur.execute("SELECT card,name,action,timestamp FROM login_logout ORDER BY id DESC")
-        rows = cur.fetchall()
         win = tk.Toplevel(self.root)
         win.title("Login / Logout History")
         win.geometry("780x540")
         win.configure(bg=self.bg)
         self.create_header(win, "Login / Logout Activity")
-        st = scrolledtext.ScrolledText(win, font=("Consolas", 11), bg="#071126", fg=self.text, padx=8, pady=8)
-        st.pack(fill=tk.BOTH, expand=True, padx=12, pady=8)
-        if not rows:
-            st.insert(tk.END, "No login/logout records.\n")
-        else:
-            for r in rows:
-                st.insert(tk.END, f"{r[3]}  |  {r[2]:<6}  |  Card: {r[0] or 'N/A'}  |  Name: {r[1] or 'N/A'}\n")
-        st.configure(state=tk.DISABLED)
+        bar = tk.Frame(win, bg=self.bg)
+        bar.pack(fill=tk.X, padx=12)
+        tk.Label(bar, text="From (YYYY-MM-DD):", bg=self.bg, fg=self.text, font=self.font_base).pack(side=tk.LEFT)
+        since = tk.Entry(bar, font=self.font_base, width=12)
+        since.pack(side=tk.LEFT, padx=6)
+        tk.Label(bar, text="To:", bg=self.bg, fg=self.text, font=self.font_base).pack(side=tk.LEFT)
+        until = tk.Entry(bar, font=self.font_base, width=12)
+        until.pack(side=tk.LEFT, padx=6)
+        view = {"st": None}
+
+        def apply():
+            if view["st"]:
+                view["st"].destroy()
+            lo, hi = since.get().strip() or None, until.get().strip()
+            hi = hi + " 23:59:59" if hi else None
+            view["st"] = self.create_paged_text(
+                body, lambda last: self.service.login_history(lo, hi, last and (last[4], last[0]), self.PAGE_SIZE),
+                lambda r: f"{r[4]}  |  {r[3]:<6}  |  Card: {r[1] or 'N/A'}  |  Name: {r[2] or 'N/A'}\n",
+                "No login/logout records.\n"
+            )
+
+        tk.Button(bar, text="Apply", bg=self.accent, fg="black", command=apply).pack(side=tk.LEFT, padx=6)
+        body = tk.Frame(win, bg=self.bg)
+        body.pack(fill=tk.BOTH, expand=True)
         tk.Button(win, text="Close", bg=self.btn, fg="white", command=win.destroy).pack(pady=8)
+        apply()
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -1,66 +1,20 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
+from tkinter import ttk, messagebox, filedialog, simpledialog
 import sqlite3
-import csv
+import threading
 from datetime import datetime
-import os
-
-DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "payroll.db")
-
-SAMPLE_EMPLOYEES = [
-    ("E0001","Rana Hossain","HR","Manager",6500,500,200),
-    ("E0002","Karim Ahmed","Finance","Analyst",4800,300,150),
-    ("E0003","Fatima Begum","IT","Developer",5200,400,180),
-    ("E0004","Arif Khan","IT","SysAdmin",5000,350,120),
-    ("E0005","Nasrin Akter","Marketing","Executive",4200,250,100),
-    ("E0006","Jamal Hassan","Sales","Sales Rep",3900,300,90),
-    ("E0007","Lina Sultana","R&D","Engineer",5600,450,200),
-    ("E0008","Sajeda Sultana Syma","Operations","Supervisor",4700,300,130),
-    ("E0009","Nadia Islam","Design","Designer",4300,200,110),
-    ("E0010","Rashed Ali","Support","Support Eng",3800,150,80),
-    ("E0011","Sumaiya Khan","HR","Recruiter",3600,180,70),
-    ("E0012","Rafiq Uddin","Finance","Controller",7000,600,250),
-    ("E0013","Priya Das","IT","QA",4100,220,90),
-    ("E0014","Tarek Rahman","Sales","Sales Lead",6000,450,200),
-    ("E0015","Nusrat Jahan","Legal","Counsel",7500,700,300),
-    ("E0016","Habib Mridha","Logistics","Coordinator",3500,120,60),
-    ("E0017","Sakib Hossain","R&D","Scientist",6800,500,220),
-    ("E0018","Mina Yasmin","Marketing","Manager",5900,400,180),
-    ("E0019","Saiful Islam","Support","Team Lead",4500,300,120),
-    ("E0020","Ruma Dey","Admin","Office Admin",3200,100,50),
-]
-
-TAX_RATE = 0.10
-
-def get_conn():
-    return sqlite3.connect(DB_PATH, timeout=10)
-
-def init_db():
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("""CREATE TABLE IF NOT EXISTS employees (
-        emp_id TEXT PRIMARY KEY, name TEXT, department TEXT, position TEXT,
-        base_salary REAL, allowances REAL, deductions REAL, created_at TEXT)""")
-    cur.execute("""CREATE TABLE IF NOT EXISTS payroll (
-        id INTEGER PRIMARY KEY, emp_id TEXT, pay_period TEXT, gross_pay REAL,
-        tax REAL, net_pay REAL, timestamp TEXT, FOREIGN KEY(emp_id) REFERENCES employees(emp_id))""")
-    conn.commit()
-    cur.execute("SELECT COUNT(*) FROM employees")
-    if cur.fetchone()[0] == 0:
-        now = datetime.now().isoformat()
-        cur.executemany(
-            "INSERT INTO employees VALUES(?,?,?,?,?,?,?,?)",
-            [(e[0],e[1],e[2],e[3],e[4],e[5],e[6],now) for e in SAMPLE_EMPLOYEES]
-        )
-        conn.commit()
-    conn.close()
+from payroll_service import PayrollDB, init_db, compute_pay, matches, payslip_text, check_period
 
 class PayrollApp:
+    PAGE_SIZE = 200
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Payroll Management System")
         self.root.geometry("900x500")
         self.root.config(padx=8, pady=8)
+        self.db = PayrollDB()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Main container
         main = ttk.PanedWindow(self.root, orient=tk.HORIZONTAL)
@@ -71,20 +25,36 @@ class PayrollApp:
         main.add(left, weight=1)
         
         ttk.Label(left, text="Employees", font=("Arial",12,"bold")).pack()
+        search_row = ttk.Frame(left)
+        search_row.pack(fill=tk.X, pady=(0,4))
+        ttk.Label(search_row, text="Search").pack(side=tk.LEFT)
+        self.search = tk.StringVar()
+        ttk.Entry(search_row, textvariable=self.search).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=4)
+        self.search.trace_add("write", lambda *a: self.schedule_search())
+        self.search_job = None
+        
+        list_frame = ttk.Frame(left)
+        list_frame.pack(fill=tk.BOTH, expand=True)
         cols = ("ID","Name","Dept")
-        self.tree = ttk.Treeview(left, columns=cols, show="headings", height=20)
+        self.tree = ttk.Treeview(list_frame, columns=cols, show="headings", height=20)
         for c in cols:
             self.tree.heading(c, text=c)
             self.tree.column(c, width=80)
+        self.vbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.vbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.configure(yscrollcommand=self.on_scroll)
         self.tree.pack(fill=tk.BOTH, expand=True)
         self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.page = {"last": "", "done": False, "prefix": ""}
         
         btn_frame = ttk.Frame(left)
         btn_frame.pack(fill=tk.X, pady=4)
         ttk.Button(btn_frame, text="Add", command=self.add_emp, width=8).pack(side=tk.LEFT)
         ttk.Button(btn_frame, text="Edit", command=self.edit_emp, width=8).pack(side=tk.LEFT)
         ttk.Button(btn_frame, text="Delete", command=self.del_emp, width=8).pack(side=tk.LEFT)
-        ttk.Button(btn_frame, text="Export", command=self.export_csv, width=8).pack(side=tk.LEFT)
+        ttk.Button(btn_frame, text="Export", command=lambda: self.export_csv("employees"), width=8).pack(side=tk.LEFT)
+        ttk.Button(btn_frame, text="Export Pay", command=lambda: self.export_csv("payroll"), width=10).pack(side=tk.LEFT)
+        ttk.Button(btn_frame, text="Import", command=self.import_csv, width=8).pack(side=tk.LEFT)
         
         # Right: Details & Payroll
         right = ttk.Frame(main)
@@ -107,6 +77,9 @@ class PayrollApp:
         pay_frame.pack(fill=tk.X, pady=4)
         ttk.Button(pay_frame, text="Compute & Save", command=self.compute_payroll).pack(side=tk.LEFT,padx=4,pady=4)
         ttk.Button(pay_frame, text="Payslip", command=self.gen_payslip).pack(side=tk.LEFT,padx=4,pady=4)
+        ttk.Button(pay_frame, text="Run Payroll", command=self.run_all).pack(side=tk.LEFT,padx=4,pady=4)
+        ttk.Button(pay_frame, text="Reports", command=self.show_reports).pack(side=tk.LEFT,padx=4,pady=4)
+        ttk.Button(pay_frame, text="All Payslips", command=self.all_payslips).pack(side=tk.LEFT,padx=4,pady=4)
         
         self.result = tk.Text(right, height=8, width=40)
         self.result.pack(fill=tk.BOTH, expand=True)
@@ -123,27 +96,55 @@ class PayrollApp:
         
         self.refresh_list()
     
+    def on_close(self):
+        try: self.db.close()
+        finally: self.root.destroy()
+    
     def refresh_list(self):
-        conn = get_conn()
-        cur = conn.cursor()
-        cur.execute("SELECT emp_id,name,department FROM employees ORDER BY emp_id")
-        for i in self.tree.get_children(): self.tree.delete(i)
-        for r in cur.fetchall(): self.tree.insert("",tk.END,values=r)
-        conn.close()
+        self.tree.delete(*self.tree.get_children())
+        self.page = {"last": "", "done": False, "prefix": self.search.get().strip()}
+        self.load_more()
         self.clear_detail()
     
+    def load_more(self):
+        pg = self.page
+        if pg["done"]: return
+        rows = self.db.employees(pg["last"], self.PAGE_SIZE, pg["prefix"])
+        pg["done"] = len(rows) < self.PAGE_SIZE
+        for r in rows: self.tree.insert("",tk.END,iid=r[0],values=r)
+        if rows: pg["last"] = rows[-1][0]
+    
+    def on_scroll(self, first, last):
+        self.vbar.set(first, last)
+        if float(last) > 0.9 and not self.page["done"]: self.tree.after_idle(self.load_more)
+    
+    def schedule_search(self):
+        if self.search_job: self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(150, self.refresh_list)
+    
+    def show_item(self, emp_id, name, dept):
+        pg = self.page
+        if not (pg["done"] or emp_id <= pg["last"]) or (pg["prefix"] and not matches(pg["prefix"], emp_id, name, dept)):
+            if self.tree.exists(emp_id): self.tree.delete(emp_id)
+            return
+        if self.tree.exists(emp_id):
+            self.tree.item(emp_id, values=(emp_id, name, dept))
+            return
+        ids = self.tree.get_children()
+        lo, hi = 0, len(ids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if ids[mid] < emp_id: lo = mid + 1
+            else: hi = mid
+        self.tree.insert("",lo,iid=emp_id,values=(emp_id, name, dept))
+    
     def on_select(self, event):
         sel = self.tree.selection()
         if sel:
-            emp_id = self.tree.item(sel[0])["values"][0]
-            self.load_emp(emp_id)
+            self.load_emp(sel[0])
     
     def load_emp(self, emp_id):
-        conn = get_conn()
-        cur = conn.cursor()
-        cur.execute("SELECT emp_id,name,department,position,base_salary,allowances,deductions FROM employees WHERE emp_id=?", (emp_id,))
-        r = cur.fetchone()
-        conn.close()
+        r = self.db.employee(emp_id)
         if r:
             self.header.config(text=f"Employee: {r[1]} ({r[0]})")
             for i, lbl in enumerate(["ID","Name","Dept","Position","Base","Allow","Ded"]):
@@ -161,20 +162,16 @@ class PayrollApp:
     def edit_emp(self):
         sel = self.tree.selection()
         if not sel: messagebox.showwarning("Select","Pick employee")
-        else: self.emp_dialog(mode="edit", emp_id=self.tree.item(sel[0])["values"][0])
+        else: self.emp_dialog(mode="edit", emp_id=sel[0])
     
     def del_emp(self):
         sel = self.tree.selection()
         if not sel: messagebox.showwarning("Select","Pick employee")
-        elif messagebox.askyesno("Delete",f"Delete {self.tree.item(sel[0])['values'][0]}?"):
-            emp_id = self.tree.item(sel[0])["values"][0]
-            conn = get_conn()
-            cur = conn.cursor()
-            cur.execute("DELETE FROM payroll WHERE emp_id=?", (emp_id,))
-            cur.execute("DELETE FROM employees WHERE emp_id=?", (emp_id,))
-            conn.commit()
-            conn.close()
-            self.refresh_list()
+        elif messagebox.askyesno("Delete",f"Delete {sel[0]}?"):
+            emp_id = sel[0]
+            self.db.delete_employee(emp_id)
+            self.tree.delete(emp_id)
+            self.clear_detail()
     
     def emp_dialog(self, mode="add", emp_id=None):
         w = tk.Toplevel(self.root)
@@ -183,15 +180,13 @@ class PayrollApp:
         for i,lbl in enumerate(["ID","Name","Dept","Position","Base","Allow","Ded"]):
             ttk.Label(w,text=lbl).grid(row=i,column=0,sticky="w",padx=4,pady=4)
             v = tk.StringVar()
-            ttk.Entry(w,textvariable=v,width=30).grid(row=i,column=1,padx=4,pady=4)
+            e = ttk.Entry(w,textvariable=v,width=30)
+            e.grid(row=i,column=1,padx=4,pady=4)
+            if lbl=="ID" and mode=="edit": e.configure(state="readonly")
             fields[lbl] = v
         
         if mode=="edit" and emp_id:
-            conn = get_conn()
-            cur = conn.cursor()
-            cur.execute("SELECT emp_id,name,department,position,base_salary,allowances,deductions FROM employees WHERE emp_id=?", (emp_id,))
-            r = cur.fetchone()
-            conn.close()
+            r = self.db.employee(emp_id)
             if r:
                 for i,lbl in enumerate(["ID","Name","Dept","Position","Base","Allow","Ded"]):
                     fields[lbl].set(str(r[i]) if r[i] else "")
@@ -202,24 +197,26 @@ class PayrollApp:
                 if not vals[0] or not vals[1]: messagebox.showwarning("Missing","ID & Name needed")
                 else:
                     base, allo, ded = float(vals[4]or 0), float(vals[5]or 0), float(vals[6]or 0)
-                    conn = get_conn()
-                    cur = conn.cursor()
-                    now = datetime.now().isoformat()
                     if mode=="add":
-                        try:
-                            cur.execute("INSERT INTO employees VALUES(?,?,?,?,?,?,?,?)",
-                                        (vals[0],vals[1],vals[2],vals[3],base,allo,ded,now))
+                        try: self.db.add_employee(vals[0],vals[1],vals[2],vals[3],base,allo,ded)
                         except sqlite3.IntegrityError:
                             messagebox.showerror("Error","ID exists")
-                            conn.close()
                             return
                     else:
-                        cur.execute("UPDATE employees SET name=?,department=?,position=?,base_salary=?,allowances=?,deductions=? WHERE emp_id=?",
-                                    (vals[1],vals[2],vals[3],base,allo,ded,vals[0]))
-                    conn.commit()
-                    conn.close()
+                        vals[0] = emp_id
+                        try: self.db.update_employee(emp_id,vals[1],vals[2],vals[3],base,allo,ded)
+                        except KeyError:
+                            messagebox.showerror("Error",f"{emp_id} no longer exists")
+                            w.destroy()
+                            if self.tree.exists(emp_id): self.tree.delete(emp_id)
+                            self.clear_detail()
+                            return
                     w.destroy()
-                    self.refresh_list()
+                    self.show_item(vals[0],vals[1],vals[2])
+                    if self.tree.exists(vals[0]):
+                        self.tree.selection_set(vals[0])
+                        self.tree.see(vals[0])
+                    self.load_emp(vals[0])
             except ValueError:
                 messagebox.showerror("Error","Salary must be numbers")
         
@@ -231,57 +228,158 @@ class PayrollApp:
         else:
             try:
                 base, allo, ded = float(self.fields["Base"].get() or 0), float(self.fields["Allow"].get() or 0), float(self.fields["Ded"].get() or 0)
-                gross = base + allo
-                tax = gross * TAX_RATE
-                net = gross - tax - ded
+                gross, tax, net = compute_pay(base, allo, ded)
                 period = datetime.now().strftime("%Y-%m")
-                conn = get_conn()
-                cur = conn.cursor()
-                cur.execute("INSERT INTO payroll VALUES(NULL,?,?,?,?,?,?)",
-                            (emp_id,period,gross,tax,net,datetime.now().isoformat()))
-                conn.commit()
-                conn.close()
+                self.db.save_payroll(emp_id,period,gross,tax,net,base,allo)
                 self.result.delete("1.0",tk.END)
                 self.result.insert(tk.END,f"Gross: ${gross:.2f}\nTax: ${tax:.2f}\nDeductions: ${ded:.2f}\nNet: ${net:.2f}\nSaved!")
                 self.refresh_hist()
             except ValueError:
                 messagebox.showerror("Error","Invalid salary")
     
+    def run_all(self):
+        period = simpledialog.askstring("Run Payroll","Pay period (YYYY-MM):",initialvalue=datetime.now().strftime("%Y-%m"),parent=self.root)
+        if not period: return
+        period = period.strip()
+        try: check_period(period)
+        except ValueError:
+            messagebox.showerror("Error","Period must be YYYY-MM")
+            return
+        if not messagebox.askyesno("Run Payroll",f"Compute payroll for all employees for {period}?\nExisting {period} entries are replaced."): return
+        n, (gross, tax, net) = self.db.run_payroll(period)
+        self.result.delete("1.0",tk.END)
+        self.result.insert(tk.END,f"Period: {period}\nEmployees: {n}\nGross: ${gross:,.2f}\nTax: ${tax:,.2f}\nNet: ${net:,.2f}\nSaved!")
+        self.refresh_hist()
+    
+    def show_reports(self):
+        w = tk.Toplevel(self.root)
+        w.title("Payroll Reports")
+        w.geometry("720x480")
+        fmt = lambda x: "" if x is None else f"{x:,.2f}"
+        totals = self.db.period_totals()
+        
+        top = ttk.Frame(w)
+        top.pack(fill=tk.X, padx=8, pady=4)
+        ttk.Label(top, text="Period").pack(side=tk.LEFT)
+        period = tk.StringVar(value=totals[0][0] if totals else datetime.now().strftime("%Y-%m"))
+        box = ttk.Combobox(top, textvariable=period, values=[t[0] for t in totals], width=10)
+        box.pack(side=tk.LEFT, padx=4)
+        
+        dept_frame = ttk.LabelFrame(w, text="By department")
+        dept_frame.pack(fill=tk.BOTH, expand=True, padx=8, pady=4)
+        cols = ("Dept","Headcount","Gross","Tax","Net","Gross vs prev")
+        dept = ttk.Treeview(dept_frame, columns=cols, show="headings", height=8)
+        for c in cols:
+            dept.heading(c, text=c)
+            dept.column(c, width=100)
+        dept.pack(fill=tk.BOTH, expand=True)
+        
+        per_frame = ttk.LabelFrame(w, text="By period")
+        per_frame.pack(fill=tk.BOTH, expand=True, padx=8, pady=4)
+        cols_p = ("Period","Headcount","Gross","Tax","Net","Gross vs prev")
+        per = ttk.Treeview(per_frame, columns=cols_p, show="headings", height=6)
+        for c in cols_p:
+            per.heading(c, text=c)
+            per.column(c, width=100)
+        per.pack(fill=tk.BOTH, expand=True)
+        for p, n, g, t, v, d in totals: per.insert("",tk.END,values=(p,n,fmt(g),fmt(t),fmt(v),fmt(d)))
+        
+        def show(*a):
+            dept.delete(*dept.get_children())
+            p = period.get().strip()
+            try: check_period(p)
+            except ValueError: return
+            for d, n, g, t, v, delta in self.db.department_report(p):
+                dept.insert("",tk.END,values=(d or "-",n,fmt(g),fmt(t),fmt(v),fmt(delta)))
+        
+        box.bind("<<ComboboxSelected>>", show)
+        box.bind("<Return>", show)
+        show()
+    
     def gen_payslip(self):
         emp_id = self.fields["ID"].get().strip()
         if not emp_id: messagebox.showwarning("Select","Pick employee")
         else:
             try:
                 base, allo, ded = float(self.fields["Base"].get() or 0), float(self.fields["Allow"].get() or 0), float(self.fields["Ded"].get() or 0)
-                gross, tax, net = base+allo, (base+allo)*TAX_RATE, (base+allo)-(base+allo)*TAX_RATE-ded
-                slip = f"PAYSLIP\n{self.fields['Name'].get()} ({emp_id})\nBase: ${base:.2f}\nAllow: ${allo:.2f}\nGross: ${gross:.2f}\nTax: ${tax:.2f}\nDed: ${ded:.2f}\nNet: ${net:.2f}"
+                gross, tax, net = compute_pay(base, allo, ded)
+                slip = payslip_text(emp_id, self.fields['Name'].get(), base, allo, gross, tax, ded, net)
                 p = filedialog.asksaveasfilename(defaultextension=".txt",filetypes=[("Text","*.txt")])
                 if p:
                     with open(p,"w") as f: f.write(slip)
                     messagebox.showinfo("Saved",f"Payslip saved")
             except: messagebox.showerror("Error","Invalid salary")
     
-    def export_csv(self):
-        p = filedialog.asksaveasfilename(defaultextension=".csv",filetypes=[("CSV","*.csv")])
+    def all_payslips(self):
+        period = simpledialog.askstring("All Payslips","Pay period (YYYY-MM):",initialvalue=datetime.now().strftime("%Y-%m"),parent=self.root)
+        if not period: return
+        period = period.strip()
+        try: check_period(period)
+        except ValueError:
+            messagebox.showerror("Error","Period must be YYYY-MM")
+            return
+        p = filedialog.asksaveasfilename(defaultextension=".zip",filetypes=[("ZIP","*.zip")],initialfile=f"payslips-{period}.zip")
+        if not p: return
+        self.run_job(f"Payslips {period}", lambda progress: self.db.write_payslips(period, p, progress),
+                     lambda n: messagebox.showinfo("Saved",f"{n:,} payslips saved") if n else messagebox.showwarning("Empty",f"No payroll for {period}"))
+    
+    def run_job(self, title, work, done):
+        w = tk.Toplevel(self.root)
+        w.title(title)
+        w.resizable(False, False)
+        w.transient(self.root)
+        status = ttk.Label(w, text="Starting...", width=40)
+        status.pack(padx=12, pady=(12,4))
+        bar = ttk.Progressbar(w, length=300, mode="determinate", maximum=1)
+        bar.pack(padx=12, pady=(0,12))
+        state = {"done": 0, "total": None, "result": None, "error": None, "finished": False}
+        
+        def progress(n, total):
+            state["done"], state["total"] = n, total
+        
+        def target():
+            try: state["result"] = work(progress)
+            except Exception as e: state["error"] = e
+            state["finished"] = True
+        
+        def poll():
+            n, total = state["done"], state["total"]
+            if total: bar.configure(value=n / total)
+            status.config(text=f"{n:,} / {total:,} rows" if total else f"{n:,} rows")
+            if not state["finished"]:
+                w.after(100, poll)
+                return
+            w.destroy()
+            if state["error"]: messagebox.showerror("Error", str(state["error"]))
+            else: done(state["result"])
+        
+        threading.Thread(target=target, name=title, daemon=True).start()
+        poll()
+    
+    def export_csv(self, table):
+        p = filedialog.asksaveasfilename(defaultextension=".csv",filetypes=[("CSV","*.csv")],initialfile=f"{table}.csv")
         if not p: return
-        conn = get_conn()
-        cur = conn.cursor()
-        cur.execute("SELECT * FROM employees ORDER BY emp_id")
-        with open(p,"w",newline='',encoding="utf-8") as f:
-            w = csv.writer(f)
-            w.writerow(["emp_id","name","department","position","base_salary","allowances","deductions","created_at"])
-            w.writerows(cur.fetchall())
-        conn.close()
-        messagebox.showinfo("Exported","CSV saved")
+        self.run_job(f"Exporting {table}", lambda progress: self.db.export_csv(table, p, progress),
+                     lambda n: messagebox.showinfo("Exported",f"{n:,} rows saved"))
+    
+    def import_csv(self):
+        p = filedialog.askopenfilename(filetypes=[("CSV","*.csv")])
+        if not p: return
+        
+        def done(result):
+            n, errors = result
+            msg = f"Imported {n:,} employees"
+            if errors:
+                msg += f"\nSkipped {len(errors):,} rows:\n" + "\n".join(f"line {k}: {e}" for k, e in errors[:10])
+            messagebox.showinfo("Imported", msg)
+            self.refresh_list()
+        
+        self.run_job("Importing employees", lambda progress: self.db.import_employees(p, progress), done)
     
     def refresh_hist(self):
-        conn = get_conn()
-        cur = conn.cursor()
-        cur.execute("SELECT emp_id,pay_period,gross_pay,tax,net_pay FROM payroll ORDER BY id DESC LIMIT 10")
         for i in self.hist.get_children(): self.hist.delete(i)
-        for r in cur.fetchall():
+        for r in self.db.recent_payroll(10):
             self.hist.insert("",tk.END,values=(r[0],r[1],f"{r[2]:.2f}",f"{r[3]:.2f}",f"{r[4]:.2f}"))
-        conn.close()
 
 if __name__ == "__main__":
     init_db()
@@ -1,13 +1,16 @@
-n = 3
-bt = [6, 8, 7]
-
-bt.sort()
-wt = [0, bt[0], bt[0]+bt[1]]
-tat = [bt[i]+wt[i] for i in range(n)]
-
-print(f"{'Process':<8}{'BT':<6}{'WT':<6}{'TAT':<6}")
-
-for i in range(n):
-    print(f"{'P'+str(i+1):<8}{bt[i]:<6}{wt[i]:<6}{tat[i]:<6}")
-print(f"\nAverage Waiting Time: {sum(wt)/n:.2f}")
-print(f"Average Turnaround Time: {sum(tat)/n:.2f}")
\ No newline at end of file
+from scheduler import ProcessTable, SJFPolicy, simulate, print_table, print_gantt, print_averages
+
+def SJF(n, at, bt):
+    res = simulate(ProcessTable(at[:n], bt[:n]), SJFPolicy())
+    return res.ct, res.wt, res.tat, list(res.seg_pid)
+
+if __name__ == "__main__":
+    n = 3
+    at = [0, 0, 0]
+    bt = [6, 8, 7]
+
+    table = ProcessTable(at, bt)
+    res = simulate(table, SJFPolicy())
+    print_table(table, res, rows=res.seg_pid)
+    print_gantt(res)
+    print_averages(res)
@@ -0,0 +1,68 @@
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from atm_service import ATMError, ATMService, AsyncATMService, now
+
+def pct(values, q):
+    s = sorted(values)
+    return s[min(len(s) - 1, int(q * len(s)))] if s else 0.0
+
+async def session(svc, card, pin, ops, rng, lat):
+    async def timed(name, coro):
+        t0 = time.perf_counter()
+        try:
+            r = await coro
+        except ATMError:
+            r = None
+        lat.setdefault(name, []).append(time.perf_counter() - t0)
+        return r
+    acct = await timed("login", svc.login(card, pin))
+    for _ in range(ops):
+        if rng.random() < 0.5:
+            await timed("withdraw", svc.withdraw(card, rng.randint(1, 200)))
+        else:
+            await timed("deposit", svc.deposit(card, rng.randint(1, 200)))
+    await timed("history", svc.transactions(card))
+    await timed("logout", svc.logout(acct))
+
+async def main(args):
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as d:
+        service = ATMService(os.path.join(d, "load.db"), pool_size=args.pool, group_commit=args.group_commit)
+        ts = now()
+        with service.pool.connection() as conn, conn:
+            conn.executemany("INSERT OR IGNORE INTO accounts(card,pin,name,balance,created_at) VALUES(?,?,?,?,?)",
+                             [(f"{900000 + i}", "0000", f"Load User {i}", 10000.0, ts) for i in range(args.accounts)])
+        svc = AsyncATMService(service, args.workers)
+        sem, lat = asyncio.Semaphore(args.concurrency), {}
+
+        async def one(i):
+            async with sem:
+                await session(svc, f"{900000 + i % args.accounts}", "0000", args.ops, random.Random(rng.random()), lat)
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.sessions)))
+        elapsed = time.perf_counter() - t0
+        svc.close()
+        service.close()
+    total = sum(len(v) for v in lat.values())
+    print(f"{args.sessions} sessions, {total} operations in {elapsed:.2f}s -> {total / elapsed:,.0f} ops/s"
+          f" ({'group commit' if args.group_commit else 'per-operation commit'}, pool={args.pool})")
+    print(f"{'op':<10}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, v in sorted(lat.items()):
+        print(f"{name:<10}{len(v):>8}{pct(v, 0.5) * 1000:>10.2f}{pct(v, 0.99) * 1000:>10.2f}")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Simulate concurrent ATM sessions against a temporary database")
+    ap.add_argument("--sessions", type=int, default=2000)
+    ap.add_argument("--concurrency", type=int, default=500, help="sessions in flight at once")
+    ap.add_argument("--accounts", type=int, default=1000)
+    ap.add_argument("--ops", type=int, default=5, help="withdrawals/deposits per session")
+    ap.add_argument("--pool", type=int, default=4, help="connection pool size")
+    ap.add_argument("--workers", type=int, default=None, help="executor threads (default: pool size)")
+    ap.add_argument("--group-commit", action="store_true")
+    ap.add_argument("--seed", type=int, default=1)
+    asyncio.run(main(ap.parse_args()))
@@ -0,0 +1,125 @@
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+import time
+from datetime import datetime
+from itertools import islice
+from atm_service import ATMService, apply_rollups, connect, now
+
+TYPES = {"deposit": "Deposit", "withdrawal": "Withdrawal", "d": "Deposit", "w": "Withdrawal"}
+
+def read_journal(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            for n, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        d = json.loads(line)
+                        yield n, d.get("card"), d.get("type"), d.get("amount"), d.get("timestamp"), line.rstrip("\n")
+                    except ValueError:
+                        yield n, None, None, None, None, line.rstrip("\n")
+            return
+        for n, row in enumerate(csv.reader(f), 1):
+            if not row or (n == 1 and row[0].strip().lower() == "card"):
+                continue
+            raw = ",".join(row)
+            row += [None] * (4 - len(row))
+            yield n, row[0], row[1], row[2], row[3], raw
+
+def validate(card, ttype, amount, stamp=None):
+    ttype = TYPES.get(str(ttype).strip().lower()) if ttype else None
+    if not card:
+        return None, None, None, "missing card"
+    if ttype is None:
+        return None, None, None, "unknown type"
+    try:
+        amount = float(amount)
+    except (TypeError, ValueError):
+        return None, None, None, "invalid amount"
+    if not (amount > 0 and math.isfinite(amount)):
+        return None, None, None, "invalid amount"
+    if stamp:
+        stamp = str(stamp).strip()
+        try:
+            stamp = datetime.strptime(stamp, "%Y-%m-%d %H:%M:%S").strftime("%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            return None, None, None, "invalid timestamp"
+    return ttype, amount, stamp or None, None
+
+def replay(conn, lines, chunk=50000, rejects=None):
+    accepted = rejected = 0
+    conn.isolation_level = None
+    it = iter(lines)
+    while True:
+        batch = list(islice(it, chunk))
+        if not batch:
+            break
+        cards = list({str(b[1]).strip() for b in batch if b[1]})
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            bal, last = {}, {}
+            for k in range(0, len(cards), 900):
+                part = cards[k:k + 900]
+                marks = ",".join("?" * len(part))
+                bal.update(conn.execute(f"SELECT card,balance FROM accounts WHERE card IN ({marks})", part))
+                last.update(conn.execute(
+                    f"SELECT card,timestamp FROM (SELECT card,timestamp,MAX(id) FROM transactions WHERE card IN ({marks}) GROUP BY card)", part))
+            delta, rows, ts = {}, [], now()
+            for n, card, ttype, amount, stamp, raw in batch:
+                card = str(card).strip() if card else None
+                ttype, amount, stamp, err = validate(card, ttype, amount, stamp)
+                if err is None and card not in bal:
+                    err = "unknown card"
+                stamp = stamp or ts
+                if err is None and stamp < last.get(card, ""):
+                    err = f"timestamp before last posting ({last[card]})"
+                if err is None and stamp > ts:
+                    err = "timestamp in the future"
+                if err is None and ttype == "Withdrawal" and amount > bal[card]:
+                    err = f"overdraft (balance {bal[card]:.2f})"
+                if err:
+                    rejected += 1
+                    if rejects:
+                        rejects.writerow([n, err, raw])
+                    continue
+                d = amount if ttype == "Deposit" else -amount
+                bal[card] += d
+                last[card] = stamp
+                delta[card] = delta.get(card, 0.0) + d
+                rows.append((card, ttype, amount, bal[card], stamp))
+            conn.executemany("INSERT INTO transactions(card,type,amount,balance_after,timestamp) VALUES(?,?,?,?,?)", rows)
+            if rows:
+                first = conn.execute("SELECT last_insert_rowid()").fetchone()[0] - len(rows) + 1
+                apply_rollups(conn, [(first + k, *r) for k, r in enumerate(rows)])
+            conn.executemany("UPDATE accounts SET balance = balance + ? WHERE card=?", [(d, c) for c, d in delta.items()])
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        accepted += len(rows)
+    return accepted, rejected
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Replay a card,type,amount[,timestamp] journal (CSV or JSONL) into atm.db")
+    ap.add_argument("journal")
+    ap.add_argument("--db", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "atm.db"))
+    ap.add_argument("--chunk", type=int, default=50000, help="journal lines per transaction")
+    ap.add_argument("--rejects", help="write rejected lines (line, reason, raw) to this CSV file")
+    args = ap.parse_args()
+    ATMService(args.db).close()
+    conn = connect(args.db)
+    conn.execute("PRAGMA cache_size=-65536")
+    out = open(args.rejects, "w", newline="", encoding="utf-8") if args.rejects else None
+    t0 = time.perf_counter()
+    try:
+        accepted, rejected = replay(conn, read_journal(args.journal), args.chunk, csv.writer(out) if out else None)
+    finally:
+        if out:
+            out.close()
+        conn.close()
+    elapsed = time.perf_counter() - t0
+    print(f"Applied {accepted} transactions, rejected {rejected} in {elapsed:.2f}s "
+          f"({(accepted + rejected) / max(elapsed, 1e-9) * 60:,.0f} lines/min)", file=sys.stderr)
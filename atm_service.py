@@ -0,0 +1,409 @@
+import asyncio
+import csv
+import gzip
+import logging
+import math
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+
+log = logging.getLogger(__name__)
+
+class ATMError(Exception):
+    pass
+
+class InsufficientFunds(ATMError):
+    pass
+
+def now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+def configure(conn):
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+def connect(db_path):
+    return configure(sqlite3.connect(db_path, timeout=10, check_same_thread=False))
+
+def post_transaction(conn, card, ttype, amount, timestamp):
+    if ttype == "Withdrawal":
+        cur = conn.execute("UPDATE accounts SET balance = balance - ? WHERE card=? AND balance >= ?", (amount, card, amount))
+    else:
+        cur = conn.execute("UPDATE accounts SET balance = balance + ? WHERE card=?", (amount, card))
+    if cur.rowcount == 0:
+        return None
+    (bal,) = conn.execute("SELECT balance FROM accounts WHERE card=?", (card,)).fetchone()
+    cur = conn.execute(
+        "INSERT INTO transactions(card,type,amount,balance_after,timestamp) VALUES(?,?,?,?,?)",
+        (card, ttype, amount, bal, timestamp)
+    )
+    apply_rollups(conn, [(cur.lastrowid, card, ttype, amount, bal, timestamp)])
+    return float(bal)
+
+def apply_rollups(conn, postings):
+    days, months = {}, {}
+    for tid, card, ttype, amount, bal, ts in postings:
+        d = days.setdefault((card, ts[:10]), [0.0, 0.0, 0, bal])
+        d[0 if ttype == "Deposit" else 1] += amount
+        d[2] += 1
+        d[3] = bal
+        months.setdefault((card, ts[:7]), (bal - amount if ttype == "Deposit" else bal + amount, tid))
+    conn.executemany(
+        "INSERT INTO daily_rollup(card,day,deposits,withdrawals,count,closing_balance) VALUES(?,?,?,?,?,?)"
+        " ON CONFLICT(card,day) DO UPDATE SET deposits=deposits+excluded.deposits, withdrawals=withdrawals+excluded.withdrawals,"
+        " count=count+excluded.count, closing_balance=excluded.closing_balance",
+        [(c, day, *v) for (c, day), v in days.items()]
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO balance_snapshots(card,month,opening_balance,first_txn_id) VALUES(?,?,?,?)",
+        [(c, month, *v) for (c, month), v in months.items()]
+    )
+
+class ConnectionPool:
+    def __init__(self, db_path, size=4):
+        self.db_path, self.size = db_path, size
+        self.idle = queue.LifoQueue(maxsize=size)
+        for _ in range(size):
+            self.idle.put(connect(db_path))
+
+    @contextmanager
+    def connection(self, timeout=None):
+        try:
+            conn = self.idle.get(timeout=timeout)
+        except queue.Empty:
+            raise ATMError("Database busy, try again") from None
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self.idle.put(conn)
+
+    def close(self):
+        for _ in range(self.size):
+            self.idle.get().close()
+
+class GroupCommitter:
+    def __init__(self, db_path, max_batch=256):
+        self.db_path, self.max_batch = db_path, max_batch
+        self.q = queue.Queue()
+        self.thread = threading.Thread(target=self._loop, name="atm-group-commit", daemon=True)
+        self.thread.start()
+
+    def submit(self, card, ttype, amount):
+        f = Future()
+        self.q.put((card, ttype, amount, f))
+        return f
+
+    def close(self):
+        self.q.put(None)
+        self.thread.join()
+
+    def _loop(self):
+        conn = connect(self.db_path)
+        stop = False
+        while not stop:
+            item = self.q.get()
+            if item is None:
+                break
+            # commit whatever queued up while the previous batch was being written; no waiting for stragglers
+            batch = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    item = self.q.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            ts = now()
+            try:
+                with conn:
+                    results = [post_transaction(conn, card, ttype, amt, ts) for card, ttype, amt, _ in batch]
+            except Exception as e:
+                for *_, f in batch: f.set_exception(e)
+            else:
+                for (*_, f), r in zip(batch, results): f.set_result(r)
+        conn.close()
+
+class AuditWriter:
+    def __init__(self, db_path, interval=1.0, max_batch=500):
+        self.db_path, self.interval, self.max_batch = db_path, interval, max_batch
+        self.buf, self.lock, self.wake, self.stopping = [], threading.Lock(), threading.Event(), False
+        self.conn = connect(db_path)
+        self.conn_lock = threading.Lock()
+        self.thread = threading.Thread(target=self._loop, name="atm-audit", daemon=True)
+        self.thread.start()
+
+    def log(self, card, name, action):
+        with self.lock:
+            self.buf.append((card, name, action, now()))
+            full = len(self.buf) >= self.max_batch
+        if full:
+            self.wake.set()
+
+    def flush(self):
+        with self.lock:
+            rows, self.buf = self.buf, []
+        if rows:
+            try:
+                with self.conn_lock, self.conn:
+                    self.conn.executemany("INSERT INTO login_logout(card,name,action,timestamp) VALUES(?,?,?,?)", rows)
+            except BaseException:
+                with self.lock:
+                    self.buf[:0] = rows
+                raise
+
+    def close(self):
+        self.stopping = True
+        self.wake.set()
+        self.thread.join()
+        self.flush()
+        self.conn.close()
+
+    def _loop(self):
+        while not self.stopping:
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                log.exception("audit flush failed, %d events kept for retry", len(self.buf))
+
+class ATMService:
+    def __init__(self, db_path, pool_size=4, group_commit=False, audit_interval=1.0):
+        self.pool = ConnectionPool(db_path, pool_size)
+        self.committer = GroupCommitter(db_path) if group_commit else None
+        self.create_tables()
+        self.seed_accounts_if_empty()
+        self.backfill_rollups()
+        self.audit = AuditWriter(db_path, audit_interval)
+
+    def close(self):
+        self.audit.close()
+        if self.committer:
+            self.committer.close()
+        self.pool.close()
+
+    def create_tables(self):
+        with self.pool.connection() as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS accounts (
+                    card TEXT PRIMARY KEY,
+                    pin TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    balance REAL NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS transactions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    card TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    amount REAL NOT NULL,
+                    balance_after REAL NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    FOREIGN KEY(card) REFERENCES accounts(card)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_transactions_card_id ON transactions(card, id)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS daily_rollup (
+                    card TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    deposits REAL NOT NULL,
+                    withdrawals REAL NOT NULL,
+                    count INTEGER NOT NULL,
+                    closing_balance REAL NOT NULL,
+                    PRIMARY KEY(card, day)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS balance_snapshots (
+                    card TEXT NOT NULL,
+                    month TEXT NOT NULL,
+                    opening_balance REAL NOT NULL,
+                    first_txn_id INTEGER NOT NULL,
+                    PRIMARY KEY(card, month)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS login_logout (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    card TEXT,
+                    name TEXT,
+                    action TEXT NOT NULL,
+                    timestamp TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_login_logout_ts ON login_logout(timestamp)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS login_logout_archive (
+                    id INTEGER PRIMARY KEY,
+                    card TEXT,
+                    name TEXT,
+                    action TEXT NOT NULL,
+                    timestamp TEXT NOT NULL
+                )
+            """)
+
+    def seed_accounts_if_empty(self, demo=None):
+        with self.pool.connection() as conn, conn:
+            (count,) = conn.execute("SELECT COUNT(*) FROM accounts").fetchone()
+            if count == 0:
+                ts = now()
+                demo = demo or [("123456", "7890", "Anamul Haque", 5000.00)]
+                conn.executemany(
+                    "INSERT OR IGNORE INTO accounts(card,pin,name,balance,created_at) VALUES(?,?,?,?,?)",
+                    [(*d, ts) for d in demo]
+                )
+
+    def backfill_rollups(self):
+        with self.pool.connection() as conn, conn:
+            if conn.execute("SELECT 1 FROM daily_rollup LIMIT 1").fetchone() or not conn.execute("SELECT 1 FROM transactions LIMIT 1").fetchone():
+                return
+            conn.execute("""
+                INSERT INTO daily_rollup(card,day,deposits,withdrawals,count,closing_balance)
+                SELECT card, day, dep, wd, n, balance_after FROM (
+                    SELECT card, substr(timestamp,1,10) AS day, SUM(CASE WHEN type='Deposit' THEN amount ELSE 0 END) AS dep,
+                           SUM(CASE WHEN type='Deposit' THEN 0 ELSE amount END) AS wd, COUNT(*) AS n, balance_after, MAX(id)
+                    FROM transactions GROUP BY card, day
+                )
+            """)
+            conn.execute("""
+                INSERT OR IGNORE INTO balance_snapshots(card,month,opening_balance,first_txn_id)
+                SELECT card, month, balance_after - (CASE WHEN type='Deposit' THEN amount ELSE -amount END), id FROM (
+                    SELECT card, substr(timestamp,1,7) AS month, type, amount, balance_after, MIN(id) AS id
+                    FROM transactions GROUP BY card, month
+                )
+            """)
+
+    def balance_at(self, card, ts):
+        with self.pool.connection() as conn:
+            snap = conn.execute("SELECT month,opening_balance,first_txn_id FROM balance_snapshots WHERE card=? AND month<=? ORDER BY month DESC LIMIT 1", (card, ts[:7])).fetchone()
+            if snap is None:
+                r = (conn.execute("SELECT opening_balance FROM balance_snapshots WHERE card=? AND month>? ORDER BY month LIMIT 1", (card, ts[:7])).fetchone()
+                     or conn.execute("SELECT balance FROM accounts WHERE card=?", (card,)).fetchone())
+                return float(r[0]) if r else 0.0
+            nxt = conn.execute("SELECT first_txn_id FROM balance_snapshots WHERE card=? AND month>? ORDER BY month LIMIT 1", (card, snap[0])).fetchone()
+            r = conn.execute(
+                "SELECT balance_after FROM transactions WHERE card=? AND id>=? AND id<? AND timestamp<=? ORDER BY id DESC LIMIT 1",
+                (card, snap[2], nxt[0] if nxt else 2**63 - 1, ts)
+            ).fetchone()
+        return float(r[0]) if r else snap[1]
+
+    def monthly_statement(self, card, month):
+        with self.pool.connection() as conn:
+            snap = conn.execute("SELECT opening_balance FROM balance_snapshots WHERE card=? AND month=?", (card, month)).fetchone()
+            days = conn.execute(
+                "SELECT day,deposits,withdrawals,count,closing_balance FROM daily_rollup WHERE card=? AND day>=? AND day<? ORDER BY day",
+                (card, month, month + "~")
+            ).fetchall()
+        opening = snap[0] if snap else self.balance_at(card, month + "-00")
+        return {"month": month, "opening": opening, "days": days,
+                "deposits": sum(d[1] for d in days), "withdrawals": sum(d[2] for d in days), "count": sum(d[3] for d in days),
+                "closing": days[-1][4] if days else opening}
+
+    def account_load(self, card):
+        with self.pool.connection() as conn:
+            r = conn.execute("SELECT card,pin,name,balance FROM accounts WHERE card=?", (card,)).fetchone()
+        return {"card": r[0], "pin": r[1], "name": r[2], "balance": float(r[3])} if r else None
+
+    def login(self, card, pin):
+        acct = self.account_load(card)
+        if acct is None:
+            raise ATMError("Card number not found")
+        if acct["pin"] != pin:
+            raise ATMError("Incorrect PIN")
+        self.record_login_logout(card, acct["name"], "Login")
+        return acct
+
+    def logout(self, acct):
+        self.record_login_logout(acct["card"], acct["name"], "Logout")
+
+    def record_login_logout(self, card, name, action):
+        self.audit.log(card, name, action)
+
+    @staticmethod
+    def _check_amount(amount):
+        if not math.isfinite(amount) or amount <= 0:
+            raise ATMError("Invalid amount")
+
+    @staticmethod
+    def _posted(ttype, new_bal):
+        if new_bal is None:
+            raise InsufficientFunds("Insufficient balance") if ttype == "Withdrawal" else ATMError("Card number not found")
+        return new_bal
+
+    def post(self, card, ttype, amount):
+        self._check_amount(amount)
+        if self.committer:
+            return self._posted(ttype, self.committer.submit(card, ttype, amount).result())
+        with self.pool.connection() as conn, conn:
+            return self._posted(ttype, post_transaction(conn, card, ttype, amount, now()))
+
+    def withdraw(self, card, amount):
+        return self.post(card, "Withdrawal", amount)
+
+    def deposit(self, card, amount):
+        return self.post(card, "Deposit", amount)
+
+    def transactions(self, card, before_id=None, limit=100):
+        with self.pool.connection() as conn:
+            return conn.execute(
+                "SELECT id,type,amount,balance_after,timestamp FROM transactions WHERE card=? AND id<? ORDER BY id DESC LIMIT ?",
+                (card, before_id if before_id is not None else 2**63 - 1, limit)
+            ).fetchall()
+
+    def login_history(self, since=None, until=None, before=None, limit=100):
+        self.audit.flush()
+        ts, rid = before or ("9999", 2**63 - 1)
+        with self.pool.connection() as conn:
+            return conn.execute(
+                "SELECT id,card,name,action,timestamp FROM login_logout"
+                " WHERE timestamp >= ? AND timestamp <= ? AND (timestamp, id) < (?, ?)"
+                " ORDER BY timestamp DESC, id DESC LIMIT ?",
+                (since or "", until or "9999", ts, rid, limit)
+            ).fetchall()
+
+    def archive_login_logout(self, older_than, path=None):
+        self.audit.flush()
+        with self.pool.connection() as conn, conn:
+            if path:
+                rows = conn.execute("SELECT id,card,name,action,timestamp FROM login_logout WHERE timestamp < ? ORDER BY id", (older_than,))
+                with gzip.open(path, "at", newline="") as f:
+                    csv.writer(f).writerows(rows)
+            else:
+                conn.execute("INSERT OR IGNORE INTO login_logout_archive SELECT id,card,name,action,timestamp FROM login_logout WHERE timestamp < ?", (older_than,))
+            return conn.execute("DELETE FROM login_logout WHERE timestamp < ?", (older_than,)).rowcount
+
+class AsyncATMService:
+    def __init__(self, service, workers=None):
+        self.service = service
+        self.executor = ThreadPoolExecutor(workers or service.pool.size, thread_name_prefix="atm")
+
+    async def _call(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    # with group commit, await the committer's future directly instead of parking an executor thread on it
+    async def _post(self, card, ttype, amount):
+        svc = self.service
+        if svc.committer is None:
+            return await self._call(svc.post, card, ttype, amount)
+        svc._check_amount(amount)
+        return svc._posted(ttype, await asyncio.wrap_future(svc.committer.submit(card, ttype, amount)))
+
+    async def login(self, card, pin): return await self._call(self.service.login, card, pin)
+    async def logout(self, acct): return await self._call(self.service.logout, acct)
+    async def withdraw(self, card, amount): return await self._post(card, "Withdrawal", amount)
+    async def deposit(self, card, amount): return await self._post(card, "Deposit", amount)
+    async def transactions(self, card, before_id=None, limit=100): return await self._call(self.service.transactions, card, before_id, limit)
+
+    def close(self):
+        self.executor.shutdown()
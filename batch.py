@@ -0,0 +1,103 @@
+import numpy as np
+from scheduler import ProcessTable, SJFPolicy, SRTFPolicy, simulate
+
+BIG = np.iinfo(np.int64).max // 4
+# each SJF/SRTF step is a masked argmin over all N columns (O(W*N^2) overall); past these widths a per-row
+# simulate() (O(N log N) each) wins, so wider batches fall back to it
+SJF_MAX_N, SRTF_MAX_N = 256, 128
+
+def _prep(at, bt):
+    bt = np.asarray(bt, dtype=np.int64)
+    at = np.zeros_like(bt) if at is None else np.asarray(at, dtype=np.int64)
+    if bt.ndim != 2 or at.shape != bt.shape: raise ValueError("at and bt must be 2-D arrays of the same shape")
+    if (bt <= 0).any(): raise ValueError("burst times must be positive")
+    return at, bt
+
+def _avgs(at, bt, tat_sum):
+    n = bt.shape[1]
+    return (tat_sum - bt.sum(1)) / n, tat_sum / n
+
+def _simulate(at, bt, policy):
+    wt, tat = np.empty(len(bt)), np.empty(len(bt))
+    for w in range(len(bt)):
+        res = simulate(ProcessTable(at[w].tolist(), bt[w].tolist()), policy())
+        wt[w], tat[w] = res.avg_wt, res.avg_tat
+    return wt, tat
+
+def sjf_batch(at, bt):
+    at, bt = _prep(at, bt)
+    W, N = bt.shape
+    if (at == at[:, :1]).all():
+        return _avgs(at, bt, np.cumsum(np.sort(bt, 1), 1).sum(1))
+    if N > SJF_MAX_N: return _simulate(at, bt, SJFPolicy)
+    rows, t, tat_sum = np.arange(W), np.zeros(W, np.int64), np.zeros(W, np.int64)
+    done = np.zeros((W, N), bool)
+    for _ in range(N):
+        t = np.maximum(t, np.where(done, BIG, at).min(1))
+        i = np.where(~done & (at <= t[:, None]), bt, BIG).argmin(1)
+        t += bt[rows, i]
+        tat_sum += t - at[rows, i]
+        done[rows, i] = True
+    return _avgs(at, bt, tat_sum)
+
+def srtf_batch(at, bt):
+    at, bt = _prep(at, bt)
+    W, N = bt.shape
+    if N > SRTF_MAX_N: return _simulate(at, bt, SRTFPolicy)
+    rows, t, tat_sum = np.arange(W), np.zeros(W, np.int64), np.zeros(W, np.int64)
+    rem = bt.copy()
+    while True:
+        live = rem > 0
+        active = live.any(1)
+        if not active.any(): break
+        t = np.where(active, np.maximum(t, np.where(live, at, BIG).min(1)), t)
+        i = np.where(live & (at <= t[:, None]), rem, BIG).argmin(1)
+        nxt = np.where(at > t[:, None], at, BIG).min(1)
+        d = np.where(active, np.minimum(rem[rows, i], nxt - t), 0)
+        t += d
+        rem[rows, i] -= d
+        fin = active & (rem[rows, i] == 0)
+        tat_sum += np.where(fin, t - at[rows, i], 0)
+    return _avgs(at, bt, tat_sum)
+
+def rr_batch(at, bt, tq):
+    at, bt = _prep(at, bt)
+    W, N = bt.shape
+    tq = np.broadcast_to(np.asarray(tq, dtype=np.int64), (W,))
+    if (tq <= 0).any(): raise ValueError("time quantum must be positive")
+    order = np.argsort(at, 1, kind="stable")
+    at, bt = np.take_along_axis(at, order, 1), np.take_along_axis(bt, order, 1)
+    rows, t, tat_sum = np.arange(W), np.zeros(W, np.int64), np.zeros(W, np.int64)
+    rem, q = bt.copy(), np.zeros((W, N), np.int64)
+    head, size, k, left = (np.zeros(W, np.int64) for _ in range(4))
+    left += N
+
+    def admit():
+        while True:
+            can = (k < N) & (at[rows, np.minimum(k, N-1)] <= t)
+            if not can.any(): return
+            r = rows[can]
+            q[r, (head[r] + size[r]) % N] = k[r]
+            size[r] += 1
+            k[r] += 1
+
+    while True:
+        active = left > 0
+        if not active.any(): break
+        idle = active & (size == 0)
+        t[idle] = np.maximum(t[idle], at[idle, k[idle]])
+        admit()
+        i = q[rows, head]
+        head = np.where(active, (head + 1) % N, head)
+        size -= active
+        d = np.where(active, np.minimum(tq, rem[rows, i]), 0)
+        t += d
+        rem[rows, i] -= d
+        admit()
+        fin = active & (rem[rows, i] == 0)
+        tat_sum += np.where(fin, t - at[rows, i], 0)
+        left -= fin
+        back = rows[active & ~fin]
+        q[back, (head[back] + size[back]) % N] = i[back]
+        size[back] += 1
+    return _avgs(at, bt, tat_sum)
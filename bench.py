@@ -0,0 +1,102 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from scheduler import ProcessTable, RRPolicy, SJFPolicy, SRTFPolicy, simulate
+
+INF = float("inf")
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+def uniform(n, rng, load=0.9, max_bt=20):
+    span = int(n * (max_bt + 1) / 2 / load)
+    return sorted(rng.randint(0, span) for _ in range(n)), [rng.randint(1, max_bt) for _ in range(n)]
+
+def poisson(n, rng, load=0.9, mean_bt=10):
+    at, t = [], 0.0
+    for _ in range(n):
+        t += rng.expovariate(load / mean_bt)
+        at.append(int(t))
+    return at, [max(1, round(rng.expovariate(1 / mean_bt))) for _ in range(n)]
+
+def heavy_tail(n, rng, load=0.9, alpha=1.5):
+    bt = [min(int(rng.paretovariate(alpha)), 100000) for _ in range(n)]
+    mean = sum(bt) / n
+    at, t = [], 0.0
+    for _ in range(n):
+        t += rng.expovariate(load / mean)
+        at.append(int(t))
+    return at, bt
+
+def bursty(n, rng, storm=200, gap=4000, max_bt=20):
+    at, t = [], 0
+    while len(at) < n:
+        at.extend([t] * min(rng.randint(1, storm), n - len(at)))
+        t += rng.randint(1, gap)
+    return at, [rng.randint(1, max_bt) for _ in range(n)]
+
+WORKLOADS = {"uniform": uniform, "poisson": poisson, "heavy_tail": heavy_tail, "bursty": bursty}
+POLICIES = {"srtf": SRTFPolicy, "rr": lambda: RRPolicy(4), "sjf": SJFPolicy}
+
+def bench(sizes, workloads, policies, seed=42, mem_max=10**5, repeat=1):
+    results = {}
+    for wl in workloads:
+        for n in sizes:
+            table = ProcessTable(*WORKLOADS[wl](n, random.Random(seed)))
+            for name in policies:
+                best = INF
+                for _ in range(repeat):
+                    t0 = time.perf_counter()
+                    res = simulate(table, POLICIES[name]())
+                    best = min(best, time.perf_counter() - t0)
+                peak = None
+                if n <= mem_max:
+                    tracemalloc.start()
+                    simulate(table, POLICIES[name]())
+                    peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                key = f"{wl}/{name}/{n}"
+                results[key] = {"seconds": round(best, 6), "throughput": round(n / best, 1),
+                                "peak_bytes": peak, "avg_wt": res.avg_wt, "avg_tat": res.avg_tat}
+                print(f"{key:<28}{best:>10.3f}s{n / best:>14,.0f} proc/s"
+                      f"{'' if peak is None else f'{peak / 2**20:>10.1f} MiB'}  WT={res.avg_wt:.2f} TAT={res.avg_tat:.2f}")
+    return results
+
+def check(results, baseline, tolerance):
+    bad = []
+    for key, r in results.items():
+        b = baseline.get(key)
+        if not b: continue
+        if (r["avg_wt"], r["avg_tat"]) != (b["avg_wt"], b["avg_tat"]):
+            bad.append(f"{key}: results changed WT {b['avg_wt']} -> {r['avg_wt']}, TAT {b['avg_tat']} -> {r['avg_tat']}")
+        if b["seconds"] >= 0.01 and r["throughput"] < b["throughput"] * (1 - tolerance):
+            bad.append(f"{key}: throughput {b['throughput']:,.0f} -> {r['throughput']:,.0f} proc/s")
+    return bad
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Benchmark the scheduling policies on seeded synthetic workloads")
+    ap.add_argument("--max-n", type=int, default=10**5, help="largest workload size (powers of ten from 10, up to 10**7)")
+    ap.add_argument("--workloads", nargs="+", choices=WORKLOADS, default=list(WORKLOADS))
+    ap.add_argument("--policies", nargs="+", choices=POLICIES, default=list(POLICIES))
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--mem-max", type=int, default=10**5, help="skip the tracemalloc pass above this size")
+    ap.add_argument("--baseline", default=BASELINE)
+    ap.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed throughput drop before flagging")
+    args = ap.parse_args()
+    sizes, n = [], 10
+    while n <= min(args.max_n, 10**7):
+        sizes.append(n)
+        n *= 10
+    results = bench(sizes, args.workloads, args.policies, args.seed, args.mem_max, args.repeat)
+    if args.save:
+        with open(args.baseline, "w") as f: json.dump(results, f, indent=1, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f: bad = check(results, json.load(f), args.tolerance)
+        for line in bad: print("REGRESSION", line)
+        if bad: sys.exit(1)
+        print("No regressions against baseline")
@@ -0,0 +1,113 @@
+import html
+import shutil
+import zlib
+
+SYMBOLS = "123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+def merge(segments):
+    out = []
+    for p, s, e in segments:
+        if out and out[-1][0] == p and out[-1][2] == s: out[-1] = (p, out[-1][1], e)
+        else: out.append((p, s, e))
+    return out
+
+def with_idle(segments, start=0):
+    out, t = [], start
+    for p, s, e in merge(segments):
+        if s > t: out.append((None, t, s))
+        out.append((p, s, e))
+        t = e
+    return out
+
+def columns(segments, cols):
+    segs = with_idle(segments, segments[0][1]) if segments else []
+    if not segs: return []
+    # a column is drawn busy when its busy share, plus what earlier columns rounded away, reaches one half,
+    # so the fraction of busy columns tracks utilization even when work is spread thinly across the lane
+    t0, span, out, j, carry = segs[0][1], segs[-1][2] - segs[0][1], [], 0, 0.0
+    for c in range(cols):
+        a, b = t0 + span*c//cols, t0 + span*(c+1)//cols
+        if a == b: continue
+        busy, k = {}, j
+        while k < len(segs) and segs[k][1] < b:
+            p, cover = segs[k][0], min(b, segs[k][2]) - max(a, segs[k][1])
+            if p is not None and cover > 0: busy[p] = busy.get(p, 0) + cover
+            k += 1
+        while j < len(segs) and segs[j][2] <= b: j += 1
+        carry += sum(busy.values()) / (b - a)
+        if busy and carry >= 0.5:
+            carry -= 1
+            out.append((max(busy, key=busy.get), a, b))
+        else: out.append((None, a, b))
+    return out
+
+def downsample(segments, cols): return merge(columns(segments, cols))
+
+def _label(p): return " -- " if p is None else f" P{p} "
+
+def _index(p): return p - 1 if isinstance(p, int) else zlib.crc32(str(p).encode())
+
+def render_text(segments, width=None, max_lines=8):
+    segs = with_idle(segments)
+    if not segs: return ""
+    width = width or shutil.get_terminal_size().columns
+    cells = [(f"|{_label(p)}", s, max(len(_label(p)) + 1, len(str(s)) + 1)) for p, s, _ in segs]
+    lines, row, used = [], [], 0
+    for c in cells:
+        if row and used + c[2] + len(str(segs[-1][2])) + 1 > width:
+            lines.append(row)
+            row, used = [], 0
+        row.append(c)
+        used += c[2]
+    lines.append(row)
+    if len(lines) > max_lines: return render_compact(segs, width)
+    out, k = [], 0
+    for row in lines:
+        k += len(row)
+        end = segs[k-1][2]
+        out.append("".join(f"{lbl:<{w}}" for lbl, _, w in row) + "|")
+        out.append("".join(f"{s:<{w}}" for _, s, w in row) + f"{end}")
+    return "\n".join(out)
+
+def render_compact(segments, width=None):
+    width = width or shutil.get_terminal_size().columns
+    cols = columns(segments, max(width - 2, 10))
+    t0, t1 = cols[0][1], cols[-1][2]
+    bar = "".join("." if p is None else SYMBOLS[_index(p) % len(SYMBOLS)] for p, _, _ in cols)
+    return (f"|{bar}|\n{t0}{t1:>{max(len(bar) + 1 - len(str(t0)), 1)}}\n"
+            f"(1 col = {(t1-t0)/len(cols):.1f} time units, '.' = idle, P1 = '1', P10 = 'A', ...)")
+
+def _color(p): return "#4b5563" if p is None else f"hsl({((_index(p) + 1)*137.508) % 360:.0f},65%,55%)"
+
+def split_lanes(segments):
+    if not segments or len(segments[0]) == 3: return [segments]
+    lanes = [[] for _ in range(max(c for _, _, _, c in segments) + 1)]
+    for p, s, e, c in segments: lanes[c].append((p, s, e))
+    return lanes
+
+def render_svg(segments, width=1200, lane=28):
+    lanes = [merge(l) for l in split_lanes(segments)]
+    lanes = [downsample(l, width) if len(l) > width else l for l in lanes]
+    if not any(lanes): return '<svg xmlns="http://www.w3.org/2000/svg"/>'
+    t0, t1 = min(l[0][1] for l in lanes if l), max(l[-1][2] for l in lanes if l)
+    k, pad, h = width / max(t1 - t0, 1), 40 if len(lanes) > 1 else 0, lane + 4
+    out = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width + pad}" height="{h*len(lanes) + 16}" font-family="monospace" font-size="11">']
+    for c, segs in enumerate(lanes):
+        y = c*h
+        if pad: out.append(f'<text x="0" y="{y + lane/2 + 4:.0f}">CPU{c}</text>')
+        for p, s, e in segs:
+            if p is None: continue
+            x, w = pad + (s - t0)*k, max((e - s)*k, 0.5)
+            out.append(f'<rect x="{x:.2f}" y="{y}" width="{w:.2f}" height="{lane}" fill="{_color(p)}"><title>P{html.escape(str(p))} {s}-{e}</title></rect>')
+            if w > 8*len(str(p)) + 12:
+                out.append(f'<text x="{x + 3:.2f}" y="{y + lane/2 + 4:.0f}">P{html.escape(str(p))}</text>')
+    y = h*len(lanes) + 12
+    out.append(f'<text x="{pad}" y="{y}">{t0}</text><text x="{width + pad}" y="{y}" text-anchor="end">{t1}</text>')
+    out.append("</svg>")
+    return "\n".join(out)
+
+def render_html(segments, title="Gantt Chart", width=1200):
+    return (f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{html.escape(title)}</title>"
+            "<style>body{background:#0f1724;color:#e6eef8;font-family:Segoe UI,sans-serif;padding:16px}"
+            "svg{background:#0b2238;overflow:visible}text{fill:#e6eef8}</style></head>\n"
+            f"<body><h2>{html.escape(title)}</h2>\n<div style=\"overflow-x:auto\">{render_svg(segments, width)}</div></body></html>\n")
@@ -0,0 +1,458 @@
+import argparse
+import csv
+import math
+import multiprocessing
+import os
+import queue
+import sqlite3
+import threading
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+import numpy as np
+
+DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "payroll.db")
+
+SAMPLE_EMPLOYEES = [
+    ("E0001","Rana Hossain","HR","Manager",6500,500,200),
+    ("E0002","Karim Ahmed","Finance","Analyst",4800,300,150),
+    ("E0003","Fatima Begum","IT","Developer",5200,400,180),
+    ("E0004","Arif Khan","IT","SysAdmin",5000,350,120),
+    ("E0005","Nasrin Akter","Marketing","Executive",4200,250,100),
+    ("E0006","Jamal Hassan","Sales","Sales Rep",3900,300,90),
+    ("E0007","Lina Sultana","R&D","Engineer",5600,450,200),
+    ("E0008","Sajeda Sultana Syma","Operations","Supervisor",4700,300,130),
+    ("E0009","Nadia Islam","Design","Designer",4300,200,110),
+    ("E0010","Rashed Ali","Support","Support Eng",3800,150,80),
+    ("E0011","Sumaiya Khan","HR","Recruiter",3600,180,70),
+    ("E0012","Rafiq Uddin","Finance","Controller",7000,600,250),
+    ("E0013","Priya Das","IT","QA",4100,220,90),
+    ("E0014","Tarek Rahman","Sales","Sales Lead",6000,450,200),
+    ("E0015","Nusrat Jahan","Legal","Counsel",7500,700,300),
+    ("E0016","Habib Mridha","Logistics","Coordinator",3500,120,60),
+    ("E0017","Sakib Hossain","R&D","Scientist",6800,500,220),
+    ("E0018","Mina Yasmin","Marketing","Manager",5900,400,180),
+    ("E0019","Saiful Islam","Support","Team Lead",4500,300,120),
+    ("E0020","Ruma Dey","Admin","Office Admin",3200,100,50),
+]
+
+TAX_RATE = 0.10
+
+EMP_COLS = "emp_id,name,department,position,base_salary,allowances,deductions"
+SQL_EMPLOYEE = f"SELECT {EMP_COLS} FROM employees WHERE emp_id=?"
+SQL_PAGE = "SELECT emp_id,name,department FROM employees WHERE emp_id>? ORDER BY emp_id LIMIT ?"
+# +emp_id keeps the planner on the three prefix index ranges (MULTI-INDEX OR) instead of a primary-key scan
+SQL_SEARCH = ("SELECT emp_id,name,department FROM employees WHERE emp_id>? AND (emp_id>=? AND emp_id<?"
+              " OR name>=? COLLATE NOCASE AND name<? COLLATE NOCASE OR department>=? COLLATE NOCASE AND department<? COLLATE NOCASE)"
+              " ORDER BY +emp_id LIMIT ?")
+SQL_RECENT = "SELECT emp_id,pay_period,gross_pay,tax,net_pay FROM payroll ORDER BY id DESC LIMIT ?"
+SQL_ADD = "INSERT INTO employees VALUES(?,?,?,?,?,?,?,?)"
+SQL_UPDATE = "UPDATE employees SET name=?,department=?,position=?,base_salary=?,allowances=?,deductions=? WHERE emp_id=?"
+SQL_PAY = "INSERT INTO payroll(emp_id,pay_period,gross_pay,tax,net_pay,timestamp,base_salary,allowances) VALUES(?,?,?,?,?,?,?,?)"
+SQL_SUMMARY = ("INSERT INTO payroll_summary VALUES(?,?,?,?,?,?) ON CONFLICT(pay_period,department) DO UPDATE SET"
+               " headcount=headcount+excluded.headcount,gross=gross+excluded.gross,tax=tax+excluded.tax,net=net+excluded.net")
+SQL_SLIPS = ("SELECT p.emp_id, e.name, COALESCE(p.base_salary,p.gross_pay), COALESCE(p.allowances,0), p.gross_pay, p.tax, p.net_pay"
+             " FROM payroll p LEFT JOIN employees e ON e.emp_id=p.emp_id WHERE p.pay_period=? ORDER BY p.emp_id")
+EXPORTS = {"employees": "SELECT * FROM employees ORDER BY emp_id", "payroll": "SELECT * FROM payroll ORDER BY id"}
+
+def get_conn():
+    return sqlite3.connect(DB_PATH, timeout=10)
+
+def connect(db_path=None, readonly=False):
+    conn = sqlite3.connect(db_path or DB_PATH, timeout=10, check_same_thread=False, cached_statements=256)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-32768")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    if readonly:
+        conn.execute("PRAGMA query_only=ON")
+    return conn
+
+def init_db():
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("""CREATE TABLE IF NOT EXISTS employees (
+        emp_id TEXT PRIMARY KEY, name TEXT, department TEXT, position TEXT,
+        base_salary REAL, allowances REAL, deductions REAL, created_at TEXT)""")
+    cur.execute("""CREATE TABLE IF NOT EXISTS payroll (
+        id INTEGER PRIMARY KEY, emp_id TEXT, pay_period TEXT, gross_pay REAL,
+        tax REAL, net_pay REAL, timestamp TEXT, base_salary REAL, allowances REAL,
+        FOREIGN KEY(emp_id) REFERENCES employees(emp_id))""")
+    # older databases: add the pay snapshot columns, backfilling rows whose gross still matches the employee's salary
+    if "base_salary" not in {r[1] for r in cur.execute("PRAGMA table_info(payroll)")}:
+        cur.execute("ALTER TABLE payroll ADD COLUMN base_salary REAL")
+        cur.execute("ALTER TABLE payroll ADD COLUMN allowances REAL")
+        cur.execute("""UPDATE payroll SET base_salary=e.base_salary, allowances=e.allowances FROM employees e
+            WHERE e.emp_id=payroll.emp_id AND abs(e.base_salary + e.allowances - payroll.gross_pay) < 0.005""")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_payroll_period_emp ON payroll(pay_period, emp_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_payroll_emp_period ON payroll(emp_id, pay_period)")
+    cur.execute("""CREATE TABLE IF NOT EXISTS payroll_summary (
+        pay_period TEXT NOT NULL, department TEXT NOT NULL, headcount INTEGER NOT NULL,
+        gross REAL NOT NULL, tax REAL NOT NULL, net REAL NOT NULL,
+        PRIMARY KEY(pay_period, department)) WITHOUT ROWID""")
+    cur.execute("""CREATE TRIGGER IF NOT EXISTS trg_employees_department AFTER UPDATE OF department ON employees
+        WHEN OLD.department IS NOT NEW.department BEGIN
+        INSERT INTO payroll_summary
+            SELECT pay_period, COALESCE(OLD.department,''), -COUNT(*), -SUM(gross_pay), -SUM(tax), -SUM(net_pay)
+            FROM payroll WHERE emp_id=NEW.emp_id GROUP BY pay_period
+            ON CONFLICT(pay_period,department) DO UPDATE SET headcount=headcount+excluded.headcount,
+            gross=gross+excluded.gross, tax=tax+excluded.tax, net=net+excluded.net;
+        INSERT INTO payroll_summary
+            SELECT pay_period, COALESCE(NEW.department,''), COUNT(*), SUM(gross_pay), SUM(tax), SUM(net_pay)
+            FROM payroll WHERE emp_id=NEW.emp_id GROUP BY pay_period
+            ON CONFLICT(pay_period,department) DO UPDATE SET headcount=headcount+excluded.headcount,
+            gross=gross+excluded.gross, tax=tax+excluded.tax, net=net+excluded.net;
+        DELETE FROM payroll_summary WHERE department=COALESCE(OLD.department,'') AND headcount<=0;
+        END""")
+    if cur.execute("SELECT 1 FROM payroll LIMIT 1").fetchone() and not cur.execute("SELECT 1 FROM payroll_summary LIMIT 1").fetchone():
+        rebuild_summary(conn)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_employees_name ON employees(name COLLATE NOCASE)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_employees_dept ON employees(department COLLATE NOCASE)")
+    conn.commit()
+    cur.execute("SELECT COUNT(*) FROM employees")
+    if cur.fetchone()[0] == 0:
+        now = datetime.now().isoformat()
+        cur.executemany(
+            "INSERT INTO employees VALUES(?,?,?,?,?,?,?,?)",
+            [(e[0],e[1],e[2],e[3],e[4],e[5],e[6],now) for e in SAMPLE_EMPLOYEES]
+        )
+        conn.commit()
+    conn.close()
+
+def rebuild_summary(conn):
+    conn.execute("DELETE FROM payroll_summary")
+    conn.execute("""INSERT INTO payroll_summary
+        SELECT p.pay_period, COALESCE(e.department,''), COUNT(*), SUM(p.gross_pay), SUM(p.tax), SUM(p.net_pay)
+        FROM payroll p LEFT JOIN employees e ON e.emp_id=p.emp_id GROUP BY 1, 2""")
+
+def apply_summary(conn, rows):
+    conn.executemany(SQL_SUMMARY, rows)
+    conn.execute("DELETE FROM payroll_summary WHERE headcount<=0")
+
+def check_period(period):
+    try:
+        ok = datetime.strptime(period, "%Y-%m").strftime("%Y-%m") == period
+    except (TypeError, ValueError):
+        ok = False
+    if not ok:
+        raise ValueError(f"pay period must be YYYY-MM, got {period!r}")
+    return period
+
+def prev_period(period):
+    y, m = int(period[:4]), int(period[5:7])
+    return f"{y - (m == 1)}-{12 if m == 1 else m - 1:02d}"
+
+def compute_pay(base, allow, ded):
+    gross = base + allow
+    tax = gross * TAX_RATE
+    return gross, tax, gross - tax - ded
+
+def matches(prefix, emp_id, name, dept):
+    p = prefix.lower()
+    return emp_id.startswith(prefix) or (name or "").lower().startswith(p) or (dept or "").lower().startswith(p)
+
+def export_csv(conn, table, path, chunk=5000, progress=None):
+    total = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    cur = conn.execute(EXPORTS[table])
+    done = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow([d[0] for d in cur.description])
+        while True:
+            rows = cur.fetchmany(chunk)
+            if not rows:
+                break
+            w.writerows(rows)
+            done += len(rows)
+            if progress:
+                progress(done, total)
+    return done
+
+def upsert_sql(cols):
+    sets = ",".join(f"{c}=excluded.{c}" for c in cols if c != "emp_id")
+    return f"INSERT INTO employees VALUES(?,?,?,?,?,?,?,?) ON CONFLICT(emp_id) DO {'UPDATE SET ' + sets if sets else 'NOTHING'}"
+
+# columns absent from the header come through as None so the upsert leaves them untouched on existing rows
+def read_employee_csv(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        r = csv.reader(f)
+        header = [h.strip().lower() for h in next(r, [])]
+        if "emp_id" not in header or "name" not in header:
+            raise ValueError("CSV needs at least emp_id and name columns")
+        idx = [header.index(c) if c in header else None for c in EMP_COLS.split(",")]
+        for n, row in enumerate(r, 2):
+            if row:
+                yield n, [None if k is None else row[k].strip() if k < len(row) else "" for k in idx]
+
+def validate_employee(vals):
+    if not vals[0] or not vals[1]:
+        return None, "missing emp_id or name"
+    try:
+        money = [float(v or 0) for v in vals[4:7]]
+    except ValueError:
+        return None, "salary fields must be numbers"
+    if not all(map(math.isfinite, money)):
+        return None, "salary fields must be finite numbers"
+    if min(money) < 0:
+        return None, "negative amount"
+    return [v or "" for v in vals[:4]] + money, None
+
+def import_employees(conn, lines, batch=20000, progress=None):
+    accepted, errors, sql = 0, [], None
+    ts = datetime.now().isoformat()
+    conn.isolation_level = None
+    try:
+        it = iter(lines)
+        while True:
+            rows = []
+            for n, vals in it:
+                sql = sql or upsert_sql([c for c, v in zip(EMP_COLS.split(","), vals) if v is not None])
+                row, err = validate_employee(vals)
+                if err:
+                    errors.append((n, err))
+                else:
+                    rows.append((*row, ts))
+                if len(rows) >= batch:
+                    break
+            if not rows:
+                break
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(sql, rows)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            accepted += len(rows)
+            if progress:
+                progress(accepted, None)
+    finally:
+        conn.isolation_level = ""
+    return accepted, errors
+
+def payslip_text(emp_id, name, base, allow, gross, tax, ded, net, period=None):
+    return (f"PAYSLIP{' ' + period if period else ''}\n{name} ({emp_id})\nBase: ${base:.2f}\nAllow: ${allow:.2f}\n"
+            f"Gross: ${gross:.2f}\nTax: ${tax:.2f}\nDed: ${ded:.2f}\nNet: ${net:.2f}")
+
+def _render_slips(period, rows):
+    return "".join(payslip_text(e, n, b, a, g, t, g - t - v, v, period) + "\n\f\n" for e, n, b, a, g, t, v in rows).encode()
+
+def write_payslips(conn, period, path, workers=None, chunk=2000, progress=None):
+    total = conn.execute("SELECT COUNT(*) FROM payroll WHERE pay_period=?", (period,)).fetchone()[0]
+    if not total:
+        return 0
+    cur = conn.execute(SQL_SLIPS, (period,))
+    workers = workers or os.cpu_count() or 1
+    pending, done = deque(), 0
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as z, \
+            z.open(f"payslips-{period}.txt", "w", force_zip64=True) as out, \
+            ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as ex:
+        def drain(keep):
+            nonlocal done
+            while len(pending) > keep:
+                n, fut = pending.popleft()
+                out.write(fut.result())
+                done += n
+                if progress:
+                    progress(done, total)
+        while True:
+            rows = cur.fetchmany(chunk)
+            if not rows:
+                break
+            pending.append((len(rows), ex.submit(_render_slips, period, rows)))
+            drain(2 * workers)
+        drain(0)
+    return done
+
+def run_payroll(conn, period, chunk=50000):
+    check_period(period)
+    ts = datetime.now().isoformat()
+    count, totals, by_dept = 0, np.zeros(3), {}
+    src = conn.cursor()
+    src.execute("SELECT emp_id, COALESCE(department,''), COALESCE(base_salary,0), COALESCE(allowances,0), COALESCE(deductions,0)"
+                " FROM employees ORDER BY emp_id")
+    conn.isolation_level = None
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM payroll WHERE pay_period=?", (period,))
+        conn.execute("DELETE FROM payroll_summary WHERE pay_period=?", (period,))
+        while True:
+            rows = src.fetchmany(chunk)
+            if not rows:
+                break
+            ids = [r[0] for r in rows]
+            cols = np.array([r[2:] for r in rows], dtype=float)
+            gross, tax, net = compute_pay(cols[:, 0], cols[:, 1], cols[:, 2])
+            conn.executemany(SQL_PAY, zip(ids, [period] * len(ids), gross.tolist(), tax.tolist(), net.tolist(), [ts] * len(ids),
+                                          cols[:, 0].tolist(), cols[:, 1].tolist()))
+            depts, inv = np.unique([r[1] for r in rows], return_inverse=True)
+            sums = [np.bincount(inv, minlength=len(depts))] + [np.bincount(inv, v, len(depts)) for v in (gross, tax, net)]
+            for k, d in enumerate(depts.tolist()):
+                acc = by_dept.setdefault(d, [0, 0.0, 0.0, 0.0])
+                for j in range(4):
+                    acc[j] += sums[j][k].item()
+            totals += gross.sum(), tax.sum(), net.sum()
+            count += len(ids)
+        apply_summary(conn, [(period, d, *v) for d, v in by_dept.items()])
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.isolation_level = ""
+    return count, tuple(totals.tolist())
+
+class PayrollDB:
+    def __init__(self, db_path=None, readers=2):
+        self.db_path = db_path
+        self.writer = connect(db_path)
+        self.lock = threading.Lock()
+        self.department_report = lru_cache(maxsize=64)(self._department_report)
+        self.period_totals = lru_cache(maxsize=16)(self._period_totals)
+        self.size = readers
+        self.idle = queue.LifoQueue(maxsize=readers)
+        for _ in range(readers):
+            self.idle.put(connect(db_path, readonly=True))
+
+    @contextmanager
+    def read(self):
+        conn = self.idle.get()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self.idle.put(conn)
+
+    @contextmanager
+    def write(self):
+        with self.lock:
+            try:
+                yield self.writer
+                self.writer.commit()
+            except BaseException:
+                self.writer.rollback()
+                raise
+            finally:
+                self.invalidate()
+
+    def invalidate(self):
+        self.department_report.cache_clear()
+        self.period_totals.cache_clear()
+
+    def employee(self, emp_id):
+        with self.read() as conn:
+            return conn.execute(SQL_EMPLOYEE, (emp_id,)).fetchone()
+
+    def employees(self, after="", limit=200, prefix=None):
+        with self.read() as conn:
+            if not prefix:
+                return conn.execute(SQL_PAGE, (after, limit)).fetchall()
+            hi = prefix + "\U0010ffff"
+            return conn.execute(SQL_SEARCH, (after, prefix, hi, prefix, hi, prefix, hi, limit)).fetchall()
+
+    def recent_payroll(self, limit=10):
+        with self.read() as conn:
+            return conn.execute(SQL_RECENT, (limit,)).fetchall()
+
+    def add_employee(self, emp_id, name, dept, position, base, allow, ded):
+        with self.write() as conn:
+            conn.execute(SQL_ADD, (emp_id, name, dept, position, base, allow, ded, datetime.now().isoformat()))
+
+    def update_employee(self, emp_id, name, dept, position, base, allow, ded):
+        with self.write() as conn:
+            if conn.execute(SQL_UPDATE, (name, dept, position, base, allow, ded, emp_id)).rowcount == 0:
+                raise KeyError(emp_id)
+
+    def delete_employee(self, emp_id):
+        with self.write() as conn:
+            apply_summary(conn, conn.execute(
+                "SELECT p.pay_period, COALESCE(e.department,''), -COUNT(*), -SUM(p.gross_pay), -SUM(p.tax), -SUM(p.net_pay)"
+                " FROM payroll p LEFT JOIN employees e ON e.emp_id=p.emp_id WHERE p.emp_id=? GROUP BY p.pay_period", (emp_id,)).fetchall())
+            conn.execute("DELETE FROM payroll WHERE emp_id=?", (emp_id,))
+            conn.execute("DELETE FROM employees WHERE emp_id=?", (emp_id,))
+
+    def save_payroll(self, emp_id, period, gross, tax, net, base=None, allow=None):
+        with self.write() as conn:
+            n, g, t, v = conn.execute("SELECT COUNT(*), TOTAL(gross_pay), TOTAL(tax), TOTAL(net_pay) FROM payroll WHERE emp_id=? AND pay_period=?",
+                                      (emp_id, period)).fetchone()
+            dept = conn.execute("SELECT COALESCE(department,'') FROM employees WHERE emp_id=?", (emp_id,)).fetchone()
+            conn.execute("DELETE FROM payroll WHERE emp_id=? AND pay_period=?", (emp_id, period))
+            conn.execute(SQL_PAY, (emp_id, period, gross, tax, net, datetime.now().isoformat(), base, allow))
+            apply_summary(conn, [(period, dept[0] if dept else "", 1 - n, gross - g, tax - t, net - v)])
+
+    def _department_report(self, period):
+        prev = prev_period(period)
+        with self.read() as conn:
+            rows = conn.execute("SELECT department, headcount, gross, tax, net FROM payroll_summary WHERE pay_period=? ORDER BY department",
+                                (period,)).fetchall()
+            last = dict(conn.execute("SELECT department, gross FROM payroll_summary WHERE pay_period=?", (prev,)))
+        return tuple((d, n, g, t, v, g - last[d] if d in last else None) for d, n, g, t, v in rows)
+
+    def _period_totals(self, limit=24):
+        with self.read() as conn:
+            rows = conn.execute("SELECT pay_period, SUM(headcount), SUM(gross), SUM(tax), SUM(net) FROM payroll_summary"
+                                " GROUP BY pay_period ORDER BY pay_period DESC LIMIT ?", (limit + 1,)).fetchall()
+        out = []
+        for k, (p, n, g, t, v) in enumerate(rows[:limit]):
+            before = rows[k + 1] if k + 1 < len(rows) and rows[k + 1][0] == prev_period(p) else None
+            out.append((p, n, g, t, v, g - before[2] if before else None))
+        return tuple(out)
+
+    @contextmanager
+    def job_connection(self, readonly=True):
+        conn = connect(self.db_path, readonly)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def export_csv(self, table, path, progress=None):
+        with self.job_connection() as conn:
+            return export_csv(conn, table, path, progress=progress)
+
+    def import_employees(self, path, progress=None):
+        with self.job_connection(readonly=False) as conn:
+            try:
+                return import_employees(conn, read_employee_csv(path), progress=progress)
+            finally:
+                self.invalidate()
+
+    def write_payslips(self, period, path, progress=None):
+        with self.job_connection() as conn:
+            return write_payslips(conn, period, path, progress=progress)
+
+    def run_payroll(self, period, chunk=50000):
+        with self.lock:
+            try:
+                return run_payroll(self.writer, period, chunk)
+            finally:
+                self.invalidate()
+
+    def close(self):
+        with self.lock:
+            self.writer.execute("PRAGMA optimize")
+            self.writer.close()
+        for _ in range(self.size):
+            self.idle.get().close()
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Run payroll for every employee for one pay period (reruns replace that period)")
+    ap.add_argument("period", nargs="?", type=check_period, default=datetime.now().strftime("%Y-%m"), help="pay period, YYYY-MM")
+    ap.add_argument("--db", default=DB_PATH)
+    ap.add_argument("--chunk", type=int, default=50000, help="employees per batch")
+    args = ap.parse_args()
+    DB_PATH = args.db
+    init_db()
+    conn = get_conn()
+    t0 = time.perf_counter()
+    try:
+        n, (gross, tax, net) = run_payroll(conn, args.period, args.chunk)
+    finally:
+        conn.close()
+    print(f"{args.period}: {n} employees in {time.perf_counter() - t0:.2f}s  gross={gross:,.2f} tax={tax:,.2f} net={net:,.2f}")
@@ -0,0 +1,71 @@
+import json
+from array import array
+
+def log2_histogram(values, weights=None):
+    buckets = {}
+    for k, v in enumerate(values):
+        b = max(int(v), 0).bit_length()
+        buckets[b] = buckets.get(b, 0) + (1 if weights is None else weights[k])
+    return [((1 << (b-1)) if b else 0, (1 << b) - 1, buckets[b]) for b in sorted(buckets)]
+
+def percentile(values, q):
+    if not values: return 0
+    s = sorted(values)
+    return s[min(len(s) - 1, int(q * len(s)))]
+
+class Probe:
+    def __init__(self, trace=False):
+        self.dispatches = self.switches = self.preemptions = 0
+        self.last = {}
+        self.depth_t, self.depth, self.busy = array("q"), array("i"), array("h")
+        self.latency = array("q")
+        self.trace = [] if trace else None
+
+    def dispatch(self, t, c, pid):
+        self.dispatches += 1
+        prev = self.last.get(c)
+        if prev is not None and prev != pid: self.switches += 1
+        self.last[c] = pid
+
+    def preempt(self, t, c, victim, pid):
+        self.preemptions += 1
+        if self.trace is not None:
+            self.trace.append({"name": "preempt", "ph": "i", "s": "t", "ts": t, "pid": 1, "tid": c,
+                               "args": {"victim": str(victim), "by": str(pid)}})
+
+    def decision(self, ns): self.latency.append(ns)
+
+    def sample(self, t, ready, busy):
+        if self.depth and self.depth[-1] == ready and self.busy[-1] == busy: return
+        self.depth_t.append(t)
+        self.depth.append(ready)
+        self.busy.append(busy)
+        if self.trace is not None:
+            self.trace.append({"name": "queue", "ph": "C", "ts": t, "pid": 1, "args": {"ready": ready, "busy": busy}})
+
+    def segment(self, pid, s, e, c):
+        if self.trace is not None:
+            self.trace.append({"name": f"P{pid}", "ph": "X", "ts": s, "dur": e - s, "pid": 1, "tid": c})
+
+    def depth_histogram(self):
+        t = self.depth_t
+        return log2_histogram(self.depth[:-1], [t[k+1] - t[k] for k in range(len(t) - 1)])
+
+    def summary(self):
+        lat = self.latency
+        out = [f"dispatches={self.dispatches} context_switches={self.switches} preemptions={self.preemptions}",
+               f"decision latency ns: p50={percentile(lat, 0.5)} p99={percentile(lat, 0.99)} max={max(lat, default=0)} n={len(lat)}",
+               "decision latency histogram (ns):"]
+        out += [f"  {lo:>10}-{hi:<10} {n}" for lo, hi, n in log2_histogram(lat)]
+        out.append("ready-queue depth histogram (time-weighted):")
+        out += [f"  {lo:>10}-{hi:<10} {n}" for lo, hi, n in self.depth_histogram()]
+        return "\n".join(out)
+
+    def write_chrome_trace(self, path):
+        meta = [{"name": "process_name", "ph": "M", "pid": 1, "args": {"name": "simulated system (1 time unit = 1us)"}}]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": meta + (self.trace or []), "displayTimeUnit": "ms",
+                       "otherData": {"dispatches": self.dispatches, "context_switches": self.switches,
+                                     "preemptions": self.preemptions,
+                                     "decision_latency_ns": log2_histogram(self.latency),
+                                     "ready_depth": self.depth_histogram()}}, f)
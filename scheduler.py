@@ -0,0 +1,287 @@
+import heapq
+from array import array
+from collections import deque
+from time import perf_counter_ns
+from gantt import render_text
+
+INF = float("inf")
+
+class ProcessTable:
+    __slots__ = ("n", "at", "bt")
+
+    def __init__(self, at, bt):
+        if len(at) != len(bt): raise ValueError("at and bt must have the same length")
+        if any(b <= 0 for b in bt): raise ValueError("burst times must be positive")
+        self.n = len(at)
+        self.at, self.bt = array("q", at), array("i", bt)
+
+    @classmethod
+    def from_buffers(cls, at, bt):
+        table = cls.__new__(cls)
+        table.at, table.bt = memoryview(at).cast("q"), memoryview(bt).cast("i")
+        table.n = len(table.at)
+        return table
+
+class Result:
+    __slots__ = ("n", "cpus", "ct", "wt", "tat", "seg_pid", "seg_start", "seg_end", "seg_core")
+
+    def __init__(self, n, cpus=1):
+        self.n, self.cpus = n, cpus
+        self.ct, self.wt, self.tat = array("q", [0])*n, array("q", [0])*n, array("q", [0])*n
+        self.seg_pid, self.seg_start, self.seg_end, self.seg_core = array("i"), array("q"), array("q"), array("h")
+
+    @property
+    def gantt(self):
+        return [(p+1, s, e) for p, s, e in zip(self.seg_pid, self.seg_start, self.seg_end)]
+
+    @property
+    def lanes(self):
+        lanes = [[] for _ in range(self.cpus)]
+        for p, s, e, c in zip(self.seg_pid, self.seg_start, self.seg_end, self.seg_core): lanes[c].append((p+1, s, e))
+        return lanes
+
+    @property
+    def avg_wt(self): return sum(self.wt) / self.n
+
+    @property
+    def avg_tat(self): return sum(self.tat) / self.n
+
+    @property
+    def switches(self):
+        last, n = [None]*self.cpus, 0
+        for p, c in zip(self.seg_pid, self.seg_core):
+            if last[c] is not None and last[c] != p: n += 1
+            last[c] = p
+        return n
+
+    @property
+    def utilization(self):
+        if not self.seg_pid: return [0.0]*self.cpus
+        busy, span = [0]*self.cpus, max(self.seg_end) - min(self.seg_start)
+        for s, e, c in zip(self.seg_start, self.seg_end, self.seg_core): busy[c] += e - s
+        return [b / span for b in busy]
+
+class SRTFPolicy:
+    preemptive = True
+    def __init__(self): self.q = []
+    def __len__(self): return len(self.q)
+    def push(self, i, r): heapq.heappush(self.q, (r, i))
+    def pop(self): return heapq.heappop(self.q)[1]
+    def peek(self): return self.q[0]
+    def slice(self, r): return r
+
+class SJFPolicy(SRTFPolicy):
+    preemptive = False
+
+class RRPolicy:
+    preemptive = False
+    def __init__(self, tq):
+        if tq <= 0: raise ValueError("time quantum must be positive")
+        self.tq, self.q = tq, deque()
+    def __len__(self): return len(self.q)
+    def push(self, i, r): self.q.append(i)
+    def pop(self): return self.q.popleft()
+    def slice(self, r): return min(self.tq, r)
+
+class _Rev:
+    __slots__ = ("k",)
+    def __init__(self, k): self.k = k
+    def __lt__(self, o): return o.k < self.k
+
+class Scheduler:
+    def __init__(self, policy, cpus=1, probe=None):
+        if cpus < 1: raise ValueError("cpus must be at least 1")
+        self.policy, self.cpus, self.t, self.probe = policy, cpus, 0, probe
+        self.live, self.pending, self.seq = {}, [], 0
+        self.job_on, self.start, self.token = [None]*cpus, [0]*cpus, [0]*cpus
+        self.free, self.ends, self.running = list(range(cpus)), [], []
+        self.submitted = self.completed = self.sum_wt = self.sum_tat = 0
+
+    def submit(self, pid, arrival, burst):
+        if arrival < self.t: raise ValueError(f"arrival {arrival} of pid {pid} is before current time {self.t}")
+        if burst <= 0: raise ValueError(f"burst time must be positive for pid {pid}")
+        if pid in self.live: raise ValueError(f"duplicate pid {pid}")
+        self.live[pid] = [arrival, burst, burst]
+        heapq.heappush(self.pending, (arrival, self.seq, pid))
+        self.seq += 1
+        self.submitted += 1
+
+    # events at exactly t stay queued so later submits arriving at t join them in order
+    def advance_to(self, t):
+        return list(self.events(t))
+
+    def drain(self):
+        return list(self.events(INF))
+
+    def metrics(self):
+        done = self.completed
+        return {"time": self.t, "submitted": self.submitted, "completed": done,
+                "running": self.cpus - len(self.free), "ready": len(self.policy), "pending": len(self.pending),
+                "avg_wt": self.sum_wt / done if done else 0.0, "avg_tat": self.sum_tat / done if done else 0.0}
+
+    def _dispatch(self, c, pid):
+        self.job_on[c], self.start[c] = pid, self.t
+        self.token[c] += 1
+        end = self.t + self.policy.slice(self.live[pid][2])
+        heapq.heappush(self.ends, (end, c, self.token[c]))
+        if self.policy.preemptive: heapq.heappush(self.running, (_Rev((end, pid)), c, self.token[c]))
+        if self.probe is not None: self.probe.dispatch(self.t, c, pid)
+
+    def _timed_pop(self):
+        t0 = perf_counter_ns()
+        pid = self.policy.pop()
+        self.probe.decision(perf_counter_ns() - t0)
+        return pid
+
+    def _admit(self, rec, t):
+        pid, a, b = rec
+        if a < t: raise ValueError(f"source is not sorted by arrival: pid {pid} arrives at {a} after time {t}")
+        if b <= 0: raise ValueError(f"burst time must be positive for pid {pid}")
+        if pid in self.live: raise ValueError(f"duplicate pid {pid}")
+        self.live[pid] = [a, b, b]
+        self.submitted += 1
+        self.policy.push(pid, b)
+
+    # source: optional iterator of (pid, arrival, burst) sorted by arrival, consumed as the clock reaches each arrival
+    def events(self, until, source=None):
+        policy, live, pending, token, start, job_on = self.policy, self.live, self.pending, self.token, self.start, self.job_on
+        free, ends, probe = self.free, self.ends, self.probe
+        pop = policy.pop if probe is None else self._timed_pop
+        nxt = next(source, None) if source is not None else None
+        while True:
+            while ends and ends[0][2] != token[ends[0][1]]: heapq.heappop(ends)
+            t = min(ends[0][0] if ends else INF, pending[0][0] if pending else INF, nxt[1] if nxt is not None else INF)
+            if t >= until or t == INF: break
+            self.t, back = t, []
+            while ends and ends[0][0] == t:
+                _, c, tok = heapq.heappop(ends)
+                if tok != token[c]: continue
+                pid = job_on[c]
+                job = live[pid]
+                if probe is not None: probe.segment(pid, start[c], t, c)
+                yield ("seg", pid, start[c], t, c)
+                job[2] -= t - start[c]
+                job_on[c] = None
+                token[c] += 1
+                heapq.heappush(free, c)
+                if job[2]: back.append(pid)
+                else:
+                    del live[pid]
+                    wt, tat = t - job[0] - job[1], t - job[0]
+                    self.completed, self.sum_wt, self.sum_tat = self.completed + 1, self.sum_wt + wt, self.sum_tat + tat
+                    yield ("done", pid, job[0], job[1], t, wt, tat)
+            while pending and pending[0][0] <= t:
+                pid = heapq.heappop(pending)[2]
+                policy.push(pid, live[pid][2])
+            while nxt is not None and nxt[1] <= t:
+                self._admit(nxt, t)
+                nxt = next(source, None)
+            for pid in back: policy.push(pid, live[pid][2])
+            while free and policy: self._dispatch(heapq.heappop(free), pop())
+            if policy.preemptive: yield from self._preempt(pop)
+            if probe is not None: probe.sample(t, len(policy), self.cpus - len(free))
+        if until != INF: self.t = max(self.t, until)
+
+    def _preempt(self, pop):
+        policy, live, t, token, start, running, probe = self.policy, self.live, self.t, self.token, self.start, self.running, self.probe
+        while policy:
+            while running and running[0][2] != token[running[0][1]]: heapq.heappop(running)
+            if not running: break
+            (end, vid), c = running[0][0].k, running[0][1]
+            if not policy.peek() < (end - t, vid): break
+            heapq.heappop(running)
+            if t > start[c]:
+                if probe is not None: probe.segment(vid, start[c], t, c)
+                yield ("seg", vid, start[c], t, c)
+            live[vid][2] = end - t
+            policy.push(vid, end - t)
+            pid = pop()
+            if probe is not None: probe.preempt(t, c, vid, pid)
+            self._dispatch(c, pid)
+        if len(running) > 4*self.cpus + 64:
+            running[:] = [r for r in running if r[2] == token[r[1]]]
+            self.ends[:] = [e for e in self.ends if e[2] == token[e[1]]]
+            heapq.heapify(running)
+            heapq.heapify(self.ends)
+
+    def _events1(self, source):
+        policy, live, admit, t = self.policy, self.live, self._admit, self.t
+        push, pop, slice_, preemptive = policy.push, policy.pop, policy.slice, policy.preemptive
+        nxt, back, submitted = next(source, None), None, self.submitted
+        while True:
+            while nxt is not None and nxt[1] <= t:
+                pid, a, b = nxt
+                if a < t or b <= 0 or pid in live: admit(nxt, t)
+                live[pid] = [a, b, b]
+                push(pid, b)
+                submitted += 1
+                nxt = next(source, None)
+            if back is not None:
+                push(back, live[back][2])
+                back = None
+            if not policy:
+                if nxt is None: break
+                t = nxt[1]
+                continue
+            pid = pop()
+            job, start = live[pid], t
+            end = t + slice_(job[2])
+            while nxt is not None and nxt[1] < end:
+                t = nxt[1]
+                while nxt is not None and nxt[1] <= t:
+                    p, a, b = nxt
+                    if a < t or b <= 0 or p in live: admit(nxt, t)
+                    live[p] = [a, b, b]
+                    push(p, b)
+                    submitted += 1
+                    nxt = next(source, None)
+                if preemptive and policy.peek() < (end - t, pid):
+                    if t > start: yield ("seg", pid, start, t, 0)
+                    job[2] = end - t
+                    push(pid, end - t)
+                    pid = pop()
+                    job, start = live[pid], t
+                    end = t + slice_(job[2])
+            t = self.t = end
+            self.submitted = submitted
+            yield ("seg", pid, start, end, 0)
+            job[2] -= end - start
+            if job[2]: back = pid
+            else:
+                del live[pid]
+                wt, tat = t - job[0] - job[1], t - job[0]
+                self.completed, self.sum_wt, self.sum_tat = self.completed + 1, self.sum_wt + wt, self.sum_tat + tat
+                yield ("done", pid, job[0], job[1], t, wt, tat)
+        self.submitted = submitted
+
+def run(source, policy, cpus=1, probe=None):
+    s = Scheduler(policy, cpus, probe)
+    if cpus == 1 and probe is None: return s._events1(iter(source))
+    return s.events(INF, iter(source))
+
+def simulate(table, policy, cpus=1, probe=None):
+    at, bt, res = table.at, table.bt, Result(table.n, cpus)
+    order = sorted(range(table.n), key=at.__getitem__)
+    sp, ss, se, sc = res.seg_pid.append, res.seg_start.append, res.seg_end.append, res.seg_core.append
+    ct, wt, tat = res.ct, res.wt, res.tat
+    for ev in run(((i, at[i], bt[i]) for i in order), policy, cpus, probe):
+        if ev[0] == "seg":
+            sp(ev[1]); ss(ev[2]); se(ev[3]); sc(ev[4])
+        else: ct[ev[1]], wt[ev[1]], tat[ev[1]] = ev[4], ev[5], ev[6]
+    return res
+
+def print_table(table, res, rows=None):
+    print("PID AT BT CT WT TAT")
+    for i in (range(res.n) if rows is None else rows):
+        print(f"{i+1:<3} {table.at[i]:<2} {table.bt[i]:<2} {res.ct[i]:<2} {res.wt[i]:<2} {res.tat[i]:<3}")
+
+def print_gantt(res, width=None):
+    print("\nGANTT CHART:")
+    if res.cpus == 1: print(render_text(res.gantt, width))
+    else:
+        for c, lane in enumerate(res.lanes): print(f"CPU{c}:\n{render_text(lane, width)}")
+
+def print_averages(res):
+    print(f"\nAvg_WT = {res.avg_wt:.2f}")
+    print(f"Avg_TAT = {res.avg_tat:.2f}")
+    if res.cpus > 1: print("Utilization = " + "  ".join(f"CPU{c}:{u:.0%}" for c, u in enumerate(res.utilization)))
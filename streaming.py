@@ -0,0 +1,95 @@
+import argparse
+import csv
+import json
+import sys
+from gantt import render_html, render_svg
+from probe import Probe
+from scheduler import SRTFPolicy, SJFPolicy, RRPolicy, run
+
+POLICIES = {"srtf": SRTFPolicy, "sjf": SJFPolicy, "rr": RRPolicy}
+
+def _int(v):
+    try: return int(v)
+    except (TypeError, ValueError): return None
+
+def _records(path, buffer_size):
+    with open(path, newline="", buffering=buffer_size) as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            for n, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        d = json.loads(line)
+                        rec = n, d.get("pid"), int(d["at"]), int(d["bt"])
+                    except (ValueError, KeyError, TypeError, AttributeError) as e:
+                        raise ValueError(f"{path}:{n}: bad trace record {line.strip()!r}") from e
+                    yield rec
+            return
+        first = True
+        for n, row in enumerate(csv.reader(f), 1):
+            if not row or row[0].startswith("#"): continue
+            try:
+                rec = (n, row[0], int(row[1]), int(row[2])) if len(row) >= 3 else (n, None, int(row[0]), int(row[1]))
+            except (ValueError, IndexError):
+                if first:
+                    first = False
+                    continue
+                raise ValueError(f"{path}:{n}: bad trace row {','.join(row)!r}") from None
+            first = False
+            yield rec
+
+# pids default to the 1-based data row; the first pid fixes their type (int if it parses, else str) for the whole trace
+def read_trace(path, buffer_size=1 << 16):
+    as_int = None
+    for k, (n, pid, at, bt) in enumerate(_records(path, buffer_size), 1):
+        if pid is None: pid = k
+        if as_int is None: as_int = _int(pid) is not None
+        if not as_int: pid = str(pid)
+        elif _int(pid) is None: raise ValueError(f"{path}:{n}: pid {pid!r} is not an integer like the first pid")
+        else: pid = _int(pid)
+        yield pid, at, bt
+
+def stream(path, policy, cpus=1, probe=None):
+    return run(read_trace(path), policy, cpus, probe)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Stream a pid,at,bt trace (CSV or JSONL, sorted by arrival) through a scheduler")
+    ap.add_argument("trace")
+    ap.add_argument("--policy", choices=POLICIES, default="srtf")
+    ap.add_argument("--tq", type=int, default=2)
+    ap.add_argument("--cpus", type=int, default=1)
+    ap.add_argument("--no-gantt", action="store_true", help="emit completion records only")
+    ap.add_argument("--svg", help="also write the Gantt chart as SVG to this path")
+    ap.add_argument("--html", help="also write the Gantt chart as a self-contained HTML page to this path")
+    ap.add_argument("--stats", action="store_true", help="print scheduler instrumentation to stderr")
+    ap.add_argument("--profile", help="write a Chrome trace (chrome://tracing, Perfetto) of the run to this path")
+    args = ap.parse_args()
+    policy = RRPolicy(args.tq) if args.policy == "rr" else POLICIES[args.policy]()
+    out = csv.writer(sys.stdout, lineterminator="\n")
+    n = wt = tat = 0
+    segs, last = ([], {}) if args.svg or args.html else (None, None)
+    probe = Probe(trace=bool(args.profile)) if args.stats or args.profile else None
+    try:
+        for ev in stream(args.trace, policy, args.cpus, probe):
+            if ev[0] == "done":
+                n, wt, tat = n + 1, wt + ev[5], tat + ev[6]
+            else:
+                if segs is not None:
+                    k = last.get(ev[4])
+                    if k is not None and segs[k][0] == ev[1] and segs[k][2] == ev[2]: segs[k] = (ev[1], segs[k][1], ev[3], ev[4])
+                    else:
+                        last[ev[4]] = len(segs)
+                        segs.append(ev[1:])
+                if args.no_gantt: continue
+            out.writerow(ev)
+    except BrokenPipeError:
+        sys.exit(0)
+    except ValueError as e:
+        sys.exit(f"error: {e}")
+    if args.svg:
+        with open(args.svg, "w") as f: f.write(render_svg(segs))
+    if args.html:
+        with open(args.html, "w") as f: f.write(render_html(segs, f"{args.policy.upper()} — {args.trace}"))
+    if n: print(f"Avg_WT = {wt/n:.2f}, Avg_TAT = {tat/n:.2f} over {n} processes", file=sys.stderr)
+    if probe is not None:
+        print(probe.summary(), file=sys.stderr)
+        if args.profile: probe.write_chrome_trace(args.profile)
@@ -0,0 +1,56 @@
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from scheduler import ProcessTable, RRPolicy, simulate
+from streaming import read_trace
+
+_shm, _tables = None, {}
+
+def _attach(name, offsets):
+    global _shm
+    _shm = shared_memory.SharedMemory(name=name)
+    buf, nat = _shm.buf, offsets[-1] * 8
+    for w in range(len(offsets) - 1):
+        a, b = offsets[w], offsets[w+1]
+        _tables[w] = ProcessTable.from_buffers(buf[a*8:b*8], buf[nat + a*4:nat + b*4])
+
+def _run(w, tq):
+    table = _tables[w]
+    res = simulate(table, RRPolicy(tq))
+    return w, tq, res.avg_wt, res.avg_tat, res.switches, max(res.ct) - min(table.at)
+
+def sweep(workloads, quanta, workers=None):
+    tables = [ProcessTable(at, bt) for at, bt in workloads]
+    if not tables or any(t.n == 0 for t in tables): raise ValueError("workloads must be non-empty")
+    offsets = [0]
+    for table in tables: offsets.append(offsets[-1] + table.n)
+    at, bt = array("q"), array("i")
+    for table in tables:
+        at.extend(table.at)
+        bt.extend(table.bt)
+    data = at.tobytes() + bt.tobytes()
+    shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    try:
+        shm.buf[:len(data)] = data
+        with ProcessPoolExecutor(workers, initializer=_attach, initargs=(shm.name, offsets)) as ex:
+            futs = [ex.submit(_run, w, tq) for w in range(len(tables)) for tq in quanta]
+            return [f.result() for f in futs]
+    finally:
+        shm.close()
+        shm.unlink()
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4:
+        sys.exit("usage: python sweep.py <trace.csv|trace.jsonl> <tq_from> <tq_to> [workers]")
+    at, bt = array("q"), array("i")
+    for _, a, b in read_trace(sys.argv[1]):
+        at.append(a)
+        bt.append(b)
+    quanta = range(int(sys.argv[2]), int(sys.argv[3]) + 1)
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else None
+    try: rows = sweep([(at, bt)], quanta, workers)
+    except ValueError as e: sys.exit(f"error: {e}")
+    print(f"{'TQ':<6}{'Avg_WT':>12}{'Avg_TAT':>12}{'Switches':>10}{'Makespan':>10}")
+    for _, tq, wt, tat, sw, span in rows:
+        print(f"{tq:<6}{wt:>12.2f}{tat:>12.2f}{sw:>10}{span:>10}")
@@ -0,0 +1,178 @@
+import heapq
+import random
+import pytest
+from gantt import render_compact
+from scheduler import ProcessTable, Scheduler, SRTFPolicy, SJFPolicy, RRPolicy, simulate
+from streaming import read_trace
+
+def _workloads(count=200, seed=7):
+    rng = random.Random(seed)
+    for _ in range(count):
+        n = rng.randint(1, 12)
+        yield [rng.randint(0, 20) for _ in range(n)], [rng.randint(1, 9) for _ in range(n)]
+
+def _tick(at, bt, cpus=1, preemptive=True):
+    n = len(at)
+    rt, ct, on, t, chart = bt[:], [0]*n, set(), 0, []
+    while any(rt):
+        ready = [i for i in range(n) if at[i] <= t and rt[i] > 0]
+        keep = [] if preemptive else sorted(on & set(ready))
+        pick = keep + sorted((i for i in ready if i not in keep), key=lambda i: (rt[i], i))[:cpus - len(keep)]
+        chart.append(pick[0] + 1 if pick else 0)
+        t += 1
+        for i in pick:
+            rt[i] -= 1
+            if not rt[i]: ct[i] = t
+        on = {i for i in pick if rt[i]}
+    return ct, chart
+
+# the original RR.py loop, which assumes arrivals are sorted by index
+def _rr(at, bt, tq):
+    n = len(at)
+    r, ct, m, q, g, time = bt[:], [0]*n, [0]*n, [0], [], 0
+    m[0] = 1
+    while q:
+        i = q.pop(0)
+        if r[i] == bt[i]: time = max(time, at[i])
+        d = min(tq, r[i])
+        g.append((i + 1, time, time + d))
+        time += d
+        r[i] -= d
+        if r[i] == 0: ct[i] = time
+        for j in range(n):
+            if r[j] > 0 and at[j] <= time and not m[j]: q.append(j); m[j] = 1
+        if r[i] > 0: q.append(i)
+        if not q:
+            for j in range(n):
+                if r[j] > 0: q.append(j); m[j] = 1; break
+    return ct, g
+
+class _HeapPolicy:
+    preemptive = True
+    def __init__(self): self.h = []
+    def __len__(self): return len(self.h)
+    def push(self, i, r): heapq.heappush(self.h, (r, i))
+    def pop(self): return heapq.heappop(self.h)[1]
+    def peek(self): return self.h[0]
+    def slice(self, r): return r
+
+def _chart(res):
+    chart = [0]*max(res.ct)
+    for p, s, e in res.gantt: chart[s:e] = [p]*(e - s)
+    return chart
+
+def test_srtf_matches_tick_loop():
+    for at, bt in _workloads():
+        res = simulate(ProcessTable(at, bt), SRTFPolicy())
+        ct, chart = _tick(at, bt)
+        assert list(res.ct) == ct
+        assert _chart(res) == chart
+
+def test_sjf_matches_tick_loop():
+    for at, bt in _workloads():
+        res = simulate(ProcessTable(at, bt), SJFPolicy())
+        assert list(res.ct) == _tick(at, bt, preemptive=False)[0]
+
+@pytest.mark.parametrize("cpus", [2, 3, 4])
+def test_multi_cpu_matches_tick_loop(cpus):
+    for at, bt in _workloads():
+        res = simulate(ProcessTable(at, bt), SRTFPolicy(), cpus)
+        assert list(res.ct) == _tick(at, bt, cpus)[0]
+
+@pytest.mark.parametrize("tq", [1, 2, 3, 5])
+def test_rr_matches_baseline_loop(tq):
+    for at, bt in _workloads():
+        at.sort()
+        res = simulate(ProcessTable(at, bt), RRPolicy(tq))
+        ct, g = _rr(at, bt, tq)
+        assert list(res.ct) == ct
+        assert res.gantt == g
+
+def test_batch_matches_simulate():
+    np = pytest.importorskip("numpy")
+    batch = pytest.importorskip("batch")
+    rng = np.random.default_rng(3)
+    at = np.sort(rng.integers(0, 30, (50, 10)), 1)
+    bt = rng.integers(1, 9, (50, 10))
+    runs = [(batch.srtf_batch(at, bt), SRTFPolicy), (batch.sjf_batch(at, bt), SJFPolicy), (batch.rr_batch(at, bt, 2), lambda: RRPolicy(2))]
+    for (wt, tat), policy in runs:
+        for w in range(len(at)):
+            res = simulate(ProcessTable(at[w].tolist(), bt[w].tolist()), policy())
+            assert wt[w] == pytest.approx(res.avg_wt)
+            assert tat[w] == pytest.approx(res.avg_tat)
+
+@pytest.mark.parametrize("cpus", [1, 2])
+def test_custom_policy(cpus):
+    for at, bt in _workloads(50):
+        table = ProcessTable(at, bt)
+        assert list(simulate(table, _HeapPolicy(), cpus).ct) == list(simulate(table, SRTFPolicy(), cpus).ct)
+
+@pytest.mark.parametrize("cpus", [1, 2])
+def test_online_scheduler_matches_simulate(cpus):
+    for at, bt in _workloads(50):
+        s, ct = Scheduler(SRTFPolicy(), cpus), [0]*len(at)
+        for i in sorted(range(len(at)), key=at.__getitem__):
+            for ev in s.advance_to(at[i]):
+                if ev[0] == "done": ct[ev[1]] = ev[4]
+            s.submit(i, at[i], bt[i])
+        for ev in s.drain():
+            if ev[0] == "done": ct[ev[1]] = ev[4]
+        assert ct == list(simulate(ProcessTable(at, bt), SRTFPolicy(), cpus).ct)
+        assert s.metrics()["completed"] == len(at)
+        with pytest.raises(ValueError):
+            s.submit(len(at), s.t - 1, 1)
+
+def test_batch_equal_arrivals_and_unsorted_input():
+    np = pytest.importorskip("numpy")
+    batch = pytest.importorskip("batch")
+    rng = np.random.default_rng(5)
+    bt = rng.integers(1, 9, (40, 10))
+    at = rng.integers(0, 30, (40, 10))
+    for a in (None, np.full_like(bt, 4)):
+        wt, tat = batch.sjf_batch(a, bt)
+        for w in range(len(bt)):
+            res = simulate(ProcessTable([0]*10 if a is None else a[w].tolist(), bt[w].tolist()), SJFPolicy())
+            assert (wt[w], tat[w]) == pytest.approx((res.avg_wt, res.avg_tat))
+    runs = [(batch.srtf_batch(at, bt), SRTFPolicy), (batch.sjf_batch(at, bt), SJFPolicy), (batch.rr_batch(at, bt, 3), lambda: RRPolicy(3))]
+    for (wt, tat), policy in runs:
+        for w in range(len(at)):
+            res = simulate(ProcessTable(at[w].tolist(), bt[w].tolist()), policy())
+            assert (wt[w], tat[w]) == pytest.approx((res.avg_wt, res.avg_tat))
+
+def test_batch_falls_back_past_max_width():
+    np = pytest.importorskip("numpy")
+    batch = pytest.importorskip("batch")
+    rng = np.random.default_rng(9)
+    n = max(batch.SRTF_MAX_N, batch.SJF_MAX_N) + 1
+    at, bt = rng.integers(0, 3*n, (3, n)), rng.integers(1, 9, (3, n))
+    for fn, policy in ((batch.srtf_batch, SRTFPolicy), (batch.sjf_batch, SJFPolicy)):
+        wt, tat = fn(at, bt)
+        for w in range(3):
+            res = simulate(ProcessTable(at[w].tolist(), bt[w].tolist()), policy())
+            assert (wt[w], tat[w]) == pytest.approx((res.avg_wt, res.avg_tat))
+
+def test_read_trace_header_and_default_pids(tmp_path):
+    p = tmp_path / "t.csv"
+    p.write_text("at,bt\n# comment\n0,5\n\n2,3\n")
+    assert list(read_trace(str(p))) == [(1, 0, 5), (2, 2, 3)]
+    p = tmp_path / "t.jsonl"
+    p.write_text('{"at": 0, "bt": 2}\n\n{"pid": 7, "at": 1, "bt": 1}\n')
+    assert list(read_trace(str(p))) == [(1, 0, 2), (7, 1, 1)]
+
+def test_read_trace_pid_types_and_errors(tmp_path):
+    p = tmp_path / "t.csv"
+    p.write_text("pid,at,bt\na,0,3\n7,1,2\n")
+    assert list(read_trace(str(p))) == [("a", 0, 3), ("7", 1, 2)]
+    p.write_text("pid,at,bt\n3,0,3\nb,1,2\n")
+    with pytest.raises(ValueError, match=":3:"):
+        list(read_trace(str(p)))
+    p.write_text("pid,at,bt\n1,0,3\n2,x,2\n")
+    with pytest.raises(ValueError, match=":3:"):
+        list(read_trace(str(p)))
+
+def test_render_compact():
+    bar = render_compact([(0, 0, 5), ("job", 5, 10), (2, 20, 30)], 32).split("\n")[0]
+    assert bar == "|" + "z"*5 + bar[6]*5 + "."*10 + "2"*10 + "|"
+    assert bar[6] not in "z."
+    thin = render_compact([(1, t, t + 1) for t in range(0, 300, 3)], 12).split("\n")[0]
+    assert 3 <= thin.count("1") <= 4